@@ -1,10 +1,19 @@
 # A parser for baltic-2 wind farm data.
+#
+# Parsing the Excel workbook is slow, so the workbook is converted once
+# into a cache of typed columns (UTC time index, wind speed and power),
+# which is used until the workbook is modified.
 
 import os
 import pathlib
 import pandas as pd
 import numpy as np
 
+from tools.series_cache import series_cache
+
+ws_col = 'Wind speed (m/s)'
+power_col = 'Measurements (MW)'
+
 
 class baltic2_xlsx:
     """Baltic-2 wind farm data class
@@ -18,11 +27,18 @@ class baltic2_xlsx:
         self.var = info['var']
         self.target_var = info['target_var']
 
-    def get_ts(self, lev):
+        self.file = os.path.join(self.path, 'Baltic2_wfdata.xlsx')
+        self.cache = series_cache(conf)
+
+        # Wind speed and power data, filled by get_data
+        self.df = None
 
-        file = os.path.join(self.path, 'Baltic2_wfdata.xlsx')
+    def read_xlsx(self):
+        """Read wind speed and power from the workbook,
+        with time index in UTC.
+        """
 
-        df = pd.read_excel(file, sheet_name='data')
+        df = pd.read_excel(self.file, sheet_name='data')
 
         df['t'] = df['t'].str.rsplit('+').str.get(0)
         df = df.set_index('t').sort_index()
@@ -33,12 +49,36 @@ class baltic2_xlsx:
 
         df = df.iloc[:, :3]
 
+        return df[[ws_col, power_col]].astype(np.float64)
+
+    def get_data(self):
+        """Return wind speed and power data from the cache, and only read
+        the workbook when it is not cached or has been modified.
+        """
+
+        if self.df is None:
+
+            # Cache key contains the modification time of the workbook
+            key = self.cache.get_key({'parser': 'baltic2_xlsx',
+                                      'file': self.file}, [self.file])
+
+            self.df = self.cache.load(key)
+
+            if self.df is None:
+
+                self.df = self.read_xlsx()
+                self.cache.save(key, self.df)
+
+        return self.df
+
+    def get_ts(self, lev):
+
         if self.var == 'ws':
-            var_col = 'Wind speed (m/s)'
+            var_col = ws_col
         if self.var == 'power':
-            var_col = 'Measurements (MW)'
+            var_col = power_col
 
-        df = df[[var_col]]
-        df.rename(columns={var_col: self.target_var}, inplace=True)
+        df = self.get_data()[[var_col]]
+        df = df.rename(columns={var_col: self.target_var})
 
         return df
@@ -7,6 +7,49 @@ import numpy as np
 import glob
 import sys
 
+# Number of header lines before the data
+header_len = 6
+# Format of the joined date and time columns
+time_format = '%Y-%m-%d %H:%M:%S'
+
+
+def read_dat(file, var):
+    """Read one variable from a FINO2 .dat file in a single pass.
+    The header lines are read directly for the variable name (2nd line)
+    and the column names (5th line), then the data are read once with
+    explicit column names and types, only keeping the date, time and
+    requested variable columns.
+    Return the data frame and the variable name.
+    """
+
+    with open(file) as f:
+
+        header = [f.readline() for i in range(header_len)]
+
+        # Blank lines are not counted, as in pd.read_csv
+        header = [line.rstrip('\r\n') for line in header if line.strip()]
+
+        var_name = header[1].split(',')[0].split(': ', 1)[1]
+        col_names = header[4].split(',')[0].split('\t')[1:]
+
+        df = pd.read_csv(
+            f, sep=r'\s+', header=None,
+            names=['date', 'time']+col_names,
+            usecols=['date', 'time', var],
+            dtype={'date': str, 'time': str, var: np.float64}
+            )
+
+    t = df['date']+' '+df['time']
+
+    try:
+        t = pd.to_datetime(t, format=time_format)
+    except ValueError:
+        t = pd.to_datetime(t)
+
+    df = df[[var]].set_index(pd.DatetimeIndex(t, name='t')).sort_index()
+
+    return df, var_name
+
 
 class fino2_dat:
     """FINO2 data class
@@ -26,38 +69,10 @@ class fino2_dat:
 
         if len(file_list) == 1:
 
-            dat_file = file_list[0]
-
-            df_all = pd.read_csv(dat_file)
-
-            # Get variable name and column names
-            var_name = df_all.iloc[0][0].split(': ', 1)[1]
-            col_names = df_all.iloc[3][0].split('\t')[1:]
-
-            df = pd.read_csv(dat_file, skiprows=6, sep='\s+')
-
-            # Turn column names into 1st row
-            df = pd.DataFrame(np.vstack([df.columns, df]))
-
-            # Combine 2 time columns, hard coded
-            df['t'] = df[0].map(str)+' '+df[1]
-
-            # Drop duplicating columns
-            df.pop(0)
-            df.pop(1)
-
-            # Reassign column names
-            for i in range(len(col_names)):
-                df[col_names[i]] = df[i+2]
-                df.pop(i+2)
-
-            df = df.set_index('t').sort_index()
-            df.index = pd.to_datetime(df.index)
+            out_df, var_name = read_dat(file_list[0], self.var)
 
             # Extract only 1 column of data
-            out_df = df.loc[:, [self.var]]
             out_df.rename(columns={self.var: var_name}, inplace=True)
-            out_df = out_df.astype(float)
 
             return out_df
 
@@ -4,7 +4,6 @@ import os
 import pathlib
 import importlib
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 
 from tools import eval_tools
@@ -27,35 +26,31 @@ class pc_csv:
         self.hh = hub_height
         self.conf = conf
 
+        # Step power curve or linear interpolation
+        self.method = conf['power_curve'].get('method', 'step')
+
         self.conf['reference']['var'] = self.power
         self.plotting = eval_tools.get_module_class('plotting', 'plot_data')(
             self.conf)
 
     def get_power(self):
-        """Convert wind speed into power using user-provided power curve."""
+        """Convert wind speed into power using user-provided power curve.
+        Use power_curve: method: in the configuration, 'step' (default)
+        or 'linear'.
+        """
 
         self.pc_df = pd.read_csv(self.file)
 
-        # Assume 0 power in the beginning
+        power = eval_tools.get_power_from_curve(
+            self.hhws_df.values, self.pc_df[self.ws].values,
+            self.pc_df[self.power].values, method=self.method
+            )
+
         power_df = pd.DataFrame(
-            0, columns=self.hhws_df.columns+'_derived_power',
+            power, columns=self.hhws_df.columns+'_derived_power',
             index=self.hhws_df.index
             )
 
-        # For each dataset (i.e. each column in data frame)
-        for hh_col, p_col in zip(self.hhws_df.columns, power_df.columns):
-
-            # When wind speed is nan, assign power to nan
-            power_df.loc[np.isnan(self.hhws_df[hh_col]), p_col]\
-                    = np.NaN
-
-            # For each wind speed (bin) in power curve
-            for i, row in self.pc_df.iterrows():
-
-                # Assign respective power when wind speed exceeds threshold
-                power_df.loc[self.hhws_df[hh_col] > row[self.ws], p_col]\
-                    = row[self.power]
-
         self.power_df = power_df.sort_index()
 
         return self.power_df
@@ -0,0 +1,112 @@
+# This class derives wind farm power for a fleet of turbine types,
+# each with its own power curve csv file, number of turbines and hub height.
+#
+# The fleet is listed in a csv file in the power curve directory,
+# with one row per turbine type and the columns:
+#   type: name of the turbine type
+#   file: power curve csv file of the turbine type
+#   count: number of turbines of the turbine type
+#   hub_height: hub height, which should be a validation level
+
+import os
+import pathlib
+import pandas as pd
+import numpy as np
+
+from tools import eval_tools
+
+
+class pc_fleet_csv:
+    """Wind farm power class, using one power curve per turbine type."""
+
+    def __init__(self, path, fleet_file, ws, power, all_lev_df, c_name,
+                 conf):
+
+        self.path = os.path.join(
+            (pathlib.Path(os.getcwd()).parent), str(path)
+            )
+        self.fleet_df = pd.read_csv(os.path.join(self.path, fleet_file))
+
+        self.ws = ws
+        self.power = power
+        # Declare wind speed data frame of all levels
+        self.all_lev_df = all_lev_df
+        self.c_name = c_name
+        self.conf = conf
+
+        # Step power curve or linear interpolation
+        self.method = conf['power_curve'].get('method', 'step')
+
+        self.conf['reference']['var'] = self.power
+        self.plotting = eval_tools.get_module_class('plotting', 'plot_data')(
+            self.conf)
+
+        self.curves = []
+
+        for file in self.fleet_df['file']:
+
+            pc_df = pd.read_csv(os.path.join(self.path, file))
+            self.curves.append((pc_df[self.ws].values,
+                                pc_df[self.power].values))
+
+    def get_hub_heights(self):
+        """Return the hub heights of all turbine types."""
+
+        return list(self.fleet_df['hub_height'])
+
+    def get_hub_height_name(self):
+        """Return the hub heights as one name, e.g. 80/120."""
+
+        return '/'.join(str(hh) for hh in dict.fromkeys(
+            self.get_hub_heights()))
+
+    def get_power(self):
+        """Convert wind speed into power of each turbine type, and sum into
+        wind farm power.
+        The power curves of all turbine types are looked up at once.
+        Use power_curve: method: in the configuration, 'step' (default)
+        or 'linear'.
+        Return wind farm power, while the power of each turbine type
+        is kept in type_power_df.
+        """
+
+        hhws_list = [self.all_lev_df.xs([hh, self.c_name], level=0, axis=1)
+                     for hh in self.get_hub_heights()]
+
+        # Time by dataset by turbine type
+        hhws = np.stack([hhws_df.values for hhws_df in hhws_list], axis=-1)
+
+        power = eval_tools.get_power_from_curves(
+            hhws, self.curves, method=self.method
+            ) * self.fleet_df['count'].values
+
+        columns = hhws_list[0].columns
+        index = hhws_list[0].index
+
+        self.type_power_df = pd.DataFrame(
+            power.reshape(len(index), -1),
+            columns=[col+'_'+str(t)+'_derived_power' for col in columns
+                     for t in self.fleet_df['type']],
+            index=index
+            ).sort_index()
+
+        # NaN wind speed at any hub height gives NaN wind farm power
+        self.power_df = pd.DataFrame(
+            power.sum(axis=-1), columns=columns+'_derived_farm_power',
+            index=index
+            ).sort_index()
+
+        return self.power_df
+
+    def plot_power_ts(self):
+        """Plot wind farm power time series."""
+
+        self.plotting.plot_ts_line(self.power_df, self.get_hub_height_name(),
+                                   self_units=False)
+
+    def plot_power_scatter(self):
+        """Plot wind farm power scatterplot."""
+
+        self.plotting.plot_pair_scatter(self.power_df,
+                                        self.get_hub_height_name(),
+                                        self_units=False)
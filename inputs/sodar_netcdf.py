@@ -3,11 +3,52 @@
 import os
 import pathlib
 import datetime
+import functools
 from netCDF4 import Dataset
 import numpy as np
-import pandas as pd
 
 from qc import check_input_data
+from tools import file_index
+from tools.level_reader import read_levels
+from tools.series_cache import get_series_cache
+from tools.ingest_manifest import get_ingest_manifest
+
+# Time stamp in file names, for indexing files by time
+file_regex = r'^(?:[^.]*\.){3}(\d{8})\.(\d{6})'
+time_format = '%Y%m%d%H%M%S'
+
+
+def get_time(file):
+    """Get time of a sodar file from its file name."""
+
+    s = '_'.join(file.split('.')[3:5])
+    # Sodar data should be in UTC time
+    t = datetime.datetime.strptime(s, '%Y%m%d_%H%M%S')
+    # If time needs to be offset to UTC time
+    # t = datetime.datetime.strptime(s, '%Y%m%d_%H%M%S')
+    #     + datetime.timedelta(hours=7)
+
+    return t
+
+
+def read_file(file_path, var, levels):
+    """Read data at all requested heights from one NetCDF file.
+    This is a module-level function, so that it can run in a process pool.
+    """
+
+    data = Dataset(file_path, 'r')
+
+    t = get_time(os.path.basename(file_path))
+
+    height = data['height'][:].data
+    height_ind = [np.where(height == lev)[0][0] for lev in levels]
+
+    # Read all requested heights in one slice
+    ws_all = data.variables[var][0, height_ind]
+
+    data.close()
+
+    return t, ws_all
 
 
 class sodar_netcdf:
@@ -25,40 +66,50 @@ class sodar_netcdf:
         self.freq = info['freq']
         self.flag = info['flag']
 
-    def get_ts(self, lev):
-        """Get time series at a certain height."""
+        # Number of processes to read files, optional
+        self.workers = info.get('workers', 1)
 
-        df = pd.DataFrame({'t': [], self.target_var: []})
+        # Only read files within the validation window
+        self.window = file_index.get_window(conf, self.freq)
+        self.file_num = None
 
-        # To print an empty line before masked value error messages
-        mask_i = 0
+        # Time series at all heights, filled by get_ts_all_levels
+        self.all_lev_df = None
 
-        for file in os.listdir(self.path):
+        # Cache of extracted time series between runs, optional
+        self.cache = get_series_cache(conf)
 
-            data = Dataset(os.path.join(self.path, file), 'r')
+        # Only read files added or changed since the last run, optional
+        self.manifest = get_ingest_manifest(conf, info)
 
-            s = '_'.join(file.split('.')[3:5])
-            # Sodar data should be in UTC time
-            t = datetime.datetime.strptime(s, '%Y%m%d_%H%M%S')
-            # If time needs to be offset to UTC time
-            # t = datetime.datetime.strptime(s, '%Y%m%d_%H%M%S')
-            #     + datetime.timedelta(hours=7)
+    def get_ts_all_levels(self, levels):
+        """Get time series at all requested heights, opening each file
+        only once. Return a time by height data frame, which get_ts then
+        indexes into for each height.
+        """
 
-            height_ind = np.where(data['height'][:].data == lev)[0][0]
+        # Dataset information for cached data
+        ds_info = {'path': self.path, 'var': self.var, 'levels': levels,
+                   'flag': self.flag}
 
-            ws = data.variables[self.var][0][height_ind]
+        self.all_lev_df = read_levels(
+            self, functools.partial(read_file, var=self.var, levels=levels),
+            ds_info, levels, file_regex, time_format
+            )
 
-            ws, mask_i = check_input_data.convert_mask_to_nan(ws, t, mask_i)
-            ws = check_input_data.convert_flag_to_nan(ws, self.flag, t)
+        return self.all_lev_df
 
-            data.close()
+    def get_ts(self, lev):
+        """Get time series at a certain height."""
 
-            df = df.append([{'t': t, self.target_var: ws}])
+        # Index into data already read by get_ts_all_levels
+        if self.all_lev_df is None or lev not in self.all_lev_df.columns:
+            self.get_ts_all_levels([lev])
 
-        df = df.set_index('t').sort_index()
+        df = self.all_lev_df[[lev]].rename(columns={lev: self.target_var})
 
-        df = check_input_data.verify_data_file_count(df, self.target_var,
-                                                     self.path, self.freq
-                                                     )
+        df = check_input_data.verify_data_file_count(
+            df, self.target_var, self.path, self.freq, file_num=self.file_num
+            )
 
         return df
@@ -4,6 +4,48 @@ import os
 import pathlib
 import pandas as pd
 
+# Candidate time formats, tried in order on the first time stamps
+# Month-day-year is tried before day-month-year, as in pd.to_datetime
+time_formats = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M:%S',
+                '%Y-%m-%dT%H:%M', '%Y/%m/%d %H:%M:%S', '%Y/%m/%d %H:%M',
+                '%m/%d/%Y %H:%M:%S', '%m/%d/%Y %H:%M', '%d/%m/%Y %H:%M:%S',
+                '%d/%m/%Y %H:%M', '%d.%m.%Y %H:%M:%S', '%d.%m.%Y %H:%M']
+
+
+def detect_time_format(t, sample_len=100):
+    """Return the first candidate time format that parses the first
+    time stamps, or None if none of them does.
+    """
+
+    sample = t.dropna().iloc[:sample_len].astype(str)
+
+    for time_format in time_formats:
+
+        try:
+            pd.to_datetime(sample, format=time_format)
+            return time_format
+        except ValueError:
+            continue
+
+    return None
+
+
+def parse_time(t):
+    """Parse time stamps with a detected, then fixed, format.
+    Fall back to format inference if no candidate format fits.
+    """
+
+    time_format = detect_time_format(t)
+
+    if time_format is not None:
+
+        try:
+            return pd.to_datetime(t, format=time_format)
+        except ValueError:
+            pass
+
+    return pd.to_datetime(t)
+
 
 class submission_csv:
 
@@ -17,9 +59,11 @@ class submission_csv:
         self.target_var = info['target_var']
         self.freq = info['freq']
 
-    def get_ts(self, lev):
+        # Time series at all heights, filled by get_ts_all_levels
+        self.all_lev_df = None
 
-        df_all = pd.read_csv(os.path.join(self.path, self.file))
+    def get_col(self, columns, lev):
+        """Find the data column at a height level."""
 
         if self.nature == 'ws':
             nature = 'speed'
@@ -31,18 +75,16 @@ class submission_csv:
         else:
             lev_str = str(lev).replace('.', '-')
 
-        col = [s for s in df_all.columns if lev_str in s and nature in s]
+        col = [s for s in columns if lev_str in s and nature in s]
 
         # When col is an empty list
         if not col:
             lev_str = str(int(float(lev)))
-            col = [s for s in df_all.columns if lev_str in s and nature in s]
+            col = [s for s in columns if lev_str in s and nature in s]
 
         # For Power
         if (not col) and (nature == 'power'):
-            col = [s for s in df_all.columns if nature.casefold() in s.casefold()]
-
-        df = df_all[col]
+            col = [s for s in columns if nature.casefold() in s.casefold()]
 
         if len(col) > 1:
             print()
@@ -50,23 +92,59 @@ class submission_csv:
             print('ERROR: SELECTING MULTIPLE COLUMNS')
             print('!!!!!!!!!!')
 
-        df = df.rename(columns={col[0]: self.target_var})
+        return col[0]
 
-        if 'time' in df_all.columns:
+    def get_time_col(self, columns):
+        """Find the time column."""
+
+        if 'time' in columns:
             t_col = 'time'
-        if 'time (UTC)' in df_all.columns:
+        if 'time (UTC)' in columns:
             t_col = 'time (UTC)'
-        if 'Date & Time (UTC)' in df_all.columns:
+        if 'Date & Time (UTC)' in columns:
             t_col = 'Date & Time (UTC)'
-        if 't' in df_all.columns:
+        if 't' in columns:
             t_col = 't'
 
-        df = df.set_index(df_all[t_col]).sort_index()
-        df.index.rename('t', inplace=True)
-        df.index = pd.to_datetime(df.index)
+        return t_col
+
+    def get_ts_all_levels(self, levels):
+        """Read the file once, only keeping the time column and the data
+        columns of all requested heights.
+        Return a time by height data frame, which get_ts then indexes into
+        for each height.
+        """
+
+        file = os.path.join(self.path, self.file)
+
+        # Only read the header to map levels to columns
+        columns = list(pd.read_csv(file, nrows=0).columns)
+
+        lev_col = {lev: self.get_col(columns, lev) for lev in levels}
+        t_col = self.get_time_col(columns)
+
+        df_all = pd.read_csv(
+            file, usecols=list(set(lev_col.values()) | {t_col})
+            )
+
+        df = pd.DataFrame({lev: df_all[col] for lev, col in lev_col.items()},
+                          columns=levels)
+
+        df.index = pd.DatetimeIndex(parse_time(df_all[t_col]), name='t')
+
         # need to sort index again for all datetime format
         # e.g. month-day-year vs day-month-year
-        df = df.sort_index()
+        self.all_lev_df = df.sort_index()
+
+        return self.all_lev_df
+
+    def get_ts(self, lev):
+
+        # Index into data already read by get_ts_all_levels
+        if self.all_lev_df is None or lev not in self.all_lev_df.columns:
+            self.get_ts_all_levels([lev])
+
+        df = self.all_lev_df[[lev]].rename(columns={lev: self.target_var})
 
         # Does not need check_input_data.verify_data_file_count()
         # because 1 csv file contains all data points
@@ -0,0 +1,58 @@
+# This script runs unit tests for the workbook cache of baltic2_xlsx.
+# The workbook is not parsed, so that the test does not need an Excel
+# reader.
+
+import os
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from tools import eval_tools
+from inputs import baltic2_xlsx
+
+df_eg = pd.DataFrame(
+    {baltic2_xlsx.ws_col: [5., 6.], baltic2_xlsx.power_col: [10., 20.]},
+    index=pd.DatetimeIndex(np.array(
+        ['2016-09-23 00:00', '2016-09-23 00:10'],
+        dtype='datetime64[ns]'), name='t')
+    )
+
+
+def test_get_data_cache(tmp_path, monkeypatch):
+
+    (tmp_path / 'data').mkdir()
+    workbook = tmp_path / 'data' / 'Baltic2_wfdata.xlsx'
+    workbook.write_text('workbook')
+
+    info = {'path': str(tmp_path / 'data'), 'var': 'ws',
+            'target_var': 'baltic2_ws'}
+    conf = {'cache': {'path': str(tmp_path / 'cache')}}
+
+    read_list = []
+
+    def read_xlsx(self):
+        read_list.append(self.file)
+        return df_eg.copy()
+
+    monkeypatch.setattr(baltic2_xlsx.baltic2_xlsx, 'read_xlsx', read_xlsx)
+
+    def get_ts():
+        return eval_tools.get_module_class('inputs', 'baltic2_xlsx')(
+            info, conf).get_ts(80)
+
+    ts = get_ts()
+    assert len(read_list) == 1
+
+    # The cached workbook data are used by a new parser
+    assert_frame_equal(get_ts(), ts)
+    assert len(read_list) == 1
+
+    # Touching the workbook invalidates the cache entry
+    stat = os.stat(workbook)
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert_frame_equal(get_ts(), ts)
+    assert len(read_list) == 2
+
+    assert list(ts.columns) == ['baltic2_ws']
+    np.testing.assert_array_equal(ts['baltic2_ws'].values, [5., 6.])
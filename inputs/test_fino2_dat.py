@@ -0,0 +1,65 @@
+# This script runs unit tests for fino2_dat, using a synthetic FINO2 .dat
+# file.
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from inputs.fino2_dat import read_dat
+
+header_eg = [
+    'FINO2 data',
+    '# Parameter: Wind speed, 102 m',
+    '# Unit: m/s',
+    '# Time zone: UTC',
+    '# Date Time\tValue\tMinimum\tMaximum\tStatus',
+    ''
+    ]
+
+
+def make_file(tmp_path, rows):
+
+    file = tmp_path / 'fino2_102m.dat'
+    file.write_text('\n'.join(header_eg + rows)+'\n')
+
+    return str(file)
+
+
+def get_df_eg(value):
+
+    return pd.DataFrame(
+        {'Value': np.array(value, dtype=np.float64)},
+        index=pd.DatetimeIndex(pd.to_datetime(
+            ['2016-09-23 00:00:00', '2016-09-23 00:10:00',
+             '2016-09-23 00:20:00']), name='t')
+        )
+
+
+def test_read_dat(tmp_path):
+
+    # Rows out of time order, and a text column that is not read
+    file = make_file(tmp_path, [
+        '2016-09-23 00:10:00 6.5 5.0 8.0 ok',
+        '2016-09-23 00:00:00 5 4.0 6.0 ok',
+        '2016-09-23 00:20:00 7.25 6.0 9.0 not_ok',
+        ])
+
+    df, var_name = read_dat(file, 'Value')
+
+    assert var_name == 'Wind speed'
+    assert_frame_equal(df, get_df_eg([5, 6.5, 7.25]))
+
+
+def test_read_dat_time_format(tmp_path):
+
+    # Times without seconds do not match the fixed format, and are inferred
+    file = make_file(tmp_path, [
+        '2016-09-23 00:00 5 4.0 6.0 ok',
+        '2016-09-23 00:10 6.5 5.0 8.0 ok',
+        '2016-09-23 00:20 7.25 6.0 9.0 ok',
+        ])
+
+    df, var_name = read_dat(file, 'Maximum')
+
+    assert_frame_equal(df, get_df_eg([6, 8, 9]).rename(
+        columns={'Value': 'Maximum'}))
@@ -0,0 +1,118 @@
+# This script runs unit tests for sodar_netcdf, using the sodar data in
+# data/mw_data_sodar.
+
+import os
+import pathlib
+import datetime
+from netCDF4 import Dataset
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_series_equal, assert_frame_equal
+
+from tools import eval_tools
+from inputs import sodar_netcdf
+
+data_path = os.path.join(
+    pathlib.Path(__file__).resolve().parent.parent, 'data', 'mw_data_sodar'
+    )
+
+levels_eg = [40, 80, 120]
+
+
+def get_info():
+
+    return {'name': 'sodar', 'path': data_path, 'var': 'wind_speed',
+            'target_var': 'sodar_ws', 'freq': 10, 'flag': 999}
+
+
+def get_conf(tmp_path):
+
+    return {'time': {'window': {'start': '2016-09-23 12:00:00',
+                                'end': '2016-09-23 15:00:00'}},
+            'cache': {'path': str(tmp_path / 'cache')}}
+
+
+def read_baseline(lev, start, end):
+    """Read one height, one file at a time, as sodar_netcdf did before
+    reading all heights in one pass.
+    """
+
+    t_list = []
+    ws_list = []
+
+    for file in sorted(os.listdir(data_path)):
+
+        s = '_'.join(file.split('.')[3:5])
+        t = datetime.datetime.strptime(s, '%Y%m%d_%H%M%S')
+
+        if t < start or t > end:
+            continue
+
+        data = Dataset(os.path.join(data_path, file), 'r')
+
+        height_ind = np.where(data['height'][:].data == lev)[0][0]
+        ws = data.variables['wind_speed'][0][height_ind]
+
+        data.close()
+
+        if np.ma.is_masked(ws) or ws == 999:
+            ws = np.nan
+
+        t_list.append(t)
+        ws_list.append(float(ws))
+
+    index = pd.DatetimeIndex(np.array(t_list, dtype='datetime64[ns]'),
+                             name='t')
+
+    return pd.Series(ws_list, index=index, name='sodar_ws')
+
+
+def test_get_ts_all_levels(tmp_path):
+
+    conf = get_conf(tmp_path)
+
+    sodar = eval_tools.get_module_class('inputs', 'sodar_netcdf')(
+        get_info(), conf)
+
+    all_lev_df = sodar.get_ts_all_levels(levels_eg)
+
+    assert list(all_lev_df.columns) == levels_eg
+
+    # Validation window extended by one data time step
+    start = datetime.datetime(2016, 9, 23, 11, 50)
+    end = datetime.datetime(2016, 9, 23, 15, 10)
+
+    for lev in levels_eg:
+
+        assert_series_equal(sodar.get_ts(lev)['sodar_ws'],
+                            read_baseline(lev, start, end))
+
+
+def test_get_ts_read_once(tmp_path, monkeypatch):
+
+    sodar = eval_tools.get_module_class('inputs', 'sodar_netcdf')(
+        get_info(), get_conf(tmp_path))
+
+    sodar.get_ts_all_levels(levels_eg)
+
+    def read_file(*args, **kwargs):
+        raise AssertionError('data files read again')
+
+    # Each height is indexed from data already read
+    monkeypatch.setattr(sodar_netcdf, 'read_file', read_file)
+
+    for lev in levels_eg:
+        sodar.get_ts(lev)
+
+
+def test_workers(tmp_path):
+
+    info = get_info()
+    info['workers'] = 2
+
+    df_1 = eval_tools.get_module_class('inputs', 'sodar_netcdf')(
+        get_info(), get_conf(tmp_path)).get_ts_all_levels(levels_eg)
+    df_2 = eval_tools.get_module_class('inputs', 'sodar_netcdf')(
+        info, get_conf(tmp_path)).get_ts_all_levels(levels_eg)
+
+    assert_frame_equal(df_2, df_1)
@@ -0,0 +1,94 @@
+# This script runs unit tests for submission_csv, using a synthetic
+# submission file.
+
+import numpy as np
+import pandas as pd
+
+from tools import eval_tools
+from inputs import submission_csv
+
+columns_eg = ['time', 'wind speed 40m', 'wind direction 40m',
+              'wind speed 92-5m', 'wind speed 120m', 'comment']
+
+
+def make_file(tmp_path, t):
+
+    df = pd.DataFrame({
+        'time': t,
+        'wind speed 40m': [5., 6., 7.],
+        'wind direction 40m': [180., 190., 200.],
+        'wind speed 92-5m': [6., 7., 8.],
+        'wind speed 120m': [7., 8., 9.],
+        'comment': ['a', 'b', 'c']
+        }, columns=columns_eg)
+
+    df.to_csv(tmp_path / 'submission.csv', index=False)
+
+
+def get_parser(tmp_path):
+
+    info = {'path': str(tmp_path), 'file': 'submission.csv', 'nature': 'ws',
+            'target_var': 'model_ws', 'freq': 10}
+
+    return eval_tools.get_module_class('inputs', 'submission_csv')(info, {})
+
+
+def test_get_col(tmp_path):
+
+    parser = get_parser(tmp_path)
+
+    assert parser.get_col(columns_eg, 40) == 'wind speed 40m'
+    assert parser.get_col(columns_eg, 92.5) == 'wind speed 92-5m'
+    # Float level matching an integer column name
+    assert parser.get_col(columns_eg, 120.0) == 'wind speed 120m'
+
+
+def test_get_ts_all_levels(tmp_path, monkeypatch):
+
+    make_file(tmp_path, ['2016-09-23 00:10:00', '2016-09-23 00:00:00',
+                         '2016-09-23 00:20:00'])
+
+    read_csv = pd.read_csv
+    usecols_list = []
+
+    def read_csv_spy(*args, **kwargs):
+        usecols_list.append(kwargs.get('usecols'))
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(submission_csv.pd, 'read_csv', read_csv_spy)
+
+    parser = get_parser(tmp_path)
+    df = parser.get_ts_all_levels([40, 92.5, 120])
+
+    # Header, then only the time and requested data columns
+    assert usecols_list[0] is None
+    assert sorted(usecols_list[1]) == ['time', 'wind speed 120m',
+                                       'wind speed 40m', 'wind speed 92-5m']
+
+    assert list(df.columns) == [40, 92.5, 120]
+    assert (df.index == pd.to_datetime(
+        ['2016-09-23 00:00', '2016-09-23 00:10', '2016-09-23 00:20'])).all()
+    np.testing.assert_array_equal(df[92.5].values, [7., 6., 8.])
+
+    ts = parser.get_ts(40)
+
+    assert list(ts.columns) == ['model_ws']
+    np.testing.assert_array_equal(ts['model_ws'].values, [6., 5., 7.])
+
+
+def test_parse_time_fallback(tmp_path):
+
+    t = pd.Series(['23 Sep 2016 00:00', '23 Sep 2016 00:10',
+                   '23 Sep 2016 00:20'])
+
+    # No candidate format fits, so the format is inferred
+    assert submission_csv.detect_time_format(t) is None
+    assert submission_csv.detect_time_format(
+        pd.Series(['23.09.2016 00:10'])) == '%d.%m.%Y %H:%M'
+
+    make_file(tmp_path, t)
+
+    df = get_parser(tmp_path).get_ts_all_levels([40])
+
+    assert (df.index == pd.to_datetime(
+        ['2016-09-23 00:00', '2016-09-23 00:10', '2016-09-23 00:20'])).all()
@@ -0,0 +1,109 @@
+# This script runs unit tests for wrf_netcdf, using the WRF data in
+# data/mw_data_wrf.
+
+import os
+import json
+import pathlib
+from netCDF4 import Dataset
+import numpy as np
+from pandas.testing import assert_frame_equal
+
+from tools import eval_tools
+from inputs import wrf_netcdf
+
+data_path = os.path.join(
+    pathlib.Path(__file__).resolve().parent.parent, 'data', 'mw_data_wrf'
+    )
+
+levels_eg = [40, 80, 120]
+
+
+def get_info():
+
+    return {'name': 'wrf', 'path': data_path, 'var': ['u', 'v'],
+            'target_var': 'wrf_ws', 'freq': 5, 'flag': 999}
+
+
+def get_conf(tmp_path):
+
+    return {'time': {'window': {'start': '2016-09-23 12:00:00',
+                                'end': '2016-09-23 12:30:00'}},
+            'location': {'lat': 45.57451, 'lon': -120.74734},
+            'cache': {'path': str(tmp_path / 'cache')}}
+
+
+def read_wrf(tmp_path, info=None):
+
+    if info is None:
+        info = get_info()
+
+    wrf = eval_tools.get_module_class('inputs', 'wrf_netcdf')(
+        info, get_conf(tmp_path))
+
+    return wrf, wrf.get_ts_all_levels(levels_eg)
+
+
+def test_ij_cache(tmp_path, monkeypatch):
+
+    wrf, df = read_wrf(tmp_path)
+
+    # Grid indices are written to the sidecar file
+    with open(os.path.join(tmp_path, 'cache', 'wrf_netcdf_ij.json')) as f:
+        ij_cache = json.load(f)
+
+    assert ij_cache == wrf.ij_cache
+    assert len(ij_cache) == 1
+
+    def get_ij(*args, **kwargs):
+        raise AssertionError('grid index computed again')
+
+    # A second run reuses the grid indices of the sidecar file
+    monkeypatch.setattr(wrf_netcdf, 'get_ij', get_ij)
+
+    wrf_2, df_2 = read_wrf(tmp_path)
+
+    assert wrf_2.ij_cache == ij_cache
+    assert_frame_equal(df_2, df)
+
+
+def test_hyperslab(tmp_path):
+
+    wrf, df = read_wrf(tmp_path)
+
+    assert len(df) > 0
+
+    # Read full horizontal planes at all levels, as before
+    for t, row in df.iterrows():
+
+        file = 'wrfout_d02_'+t.strftime('%Y-%m-%d_%H_%M_%S')+'.nc'
+        data = Dataset(os.path.join(data_path, file), 'r')
+
+        i, j = wrf_netcdf.get_ij(data, wrf.loc)
+
+        level = data['level'][:].data
+        u = data.variables['u'][:]
+        v = data.variables['v'][:]
+
+        data.close()
+
+        for lev in levels_eg:
+
+            k = np.where(level == lev)[0][0]
+            u_k = u[k][i][j]
+            v_k = v[k][i][j]
+            ws = np.sqrt(u_k*u_k + v_k*v_k)
+
+            assert row[lev] == float(ws)
+
+
+def test_workers(tmp_path):
+
+    info = get_info()
+    info['workers'] = 2
+
+    # Separate caches, so that grid indices are computed in both runs
+    wrf_1, df_1 = read_wrf(tmp_path / '1')
+    wrf_2, df_2 = read_wrf(tmp_path / '2', info)
+
+    assert_frame_equal(df_2, df_1)
+    assert wrf_2.ij_cache == wrf_1.ij_cache
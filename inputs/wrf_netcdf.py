@@ -9,12 +9,115 @@
 
 import os
 import pathlib
+import json
+import hashlib
+import functools
 from datetime import datetime
 from netCDF4 import Dataset
 import numpy as np
-import pandas as pd
 
 from qc import check_input_data
+from tools import eval_tools, file_index
+from tools.level_reader import read_levels
+from tools.series_cache import get_series_cache
+from tools.ingest_manifest import get_ingest_manifest
+
+# Time stamp in file names, for indexing files by time
+file_regex = r'^[^_]*_[^_]*_(\d{4}-\d{2}-\d{2})_(\d{2})_(\d{2})_(\d{2})'
+time_format = '%Y-%m-%d%H%M%S'
+
+
+# For WRF mountain wave demo case
+def get_ij(ih, loc):
+    """Return data index (i and j) for nc file at a specified target
+    location.
+    """
+
+    lat = np.array(ih['XLAT'])
+    lon = np.array(ih['XLONG'])
+
+    # If lat/lon were arrays (instead of matrixes)
+    # something like this would work:
+    # d = np.fromfunction(lambda x,y: (lon[x] - loc['lon'])**2
+    # + (lat[y] - loc['lat'])**2, (len(lon), len(lat)), dype=float)
+
+    # This is most appropriate for Equator coordinates
+    d = (lat - loc['lat'])**2 + (lon - loc['lon'])**2
+
+    i, j = np.unravel_index(np.argmin(d), d.shape)
+
+    return i, j
+
+
+def get_grid_key(ih, loc):
+    """Return a key of the model grid and the target location,
+    using grid shape and a checksum of the grid corner coordinates.
+    Only the corner points are read from the file.
+    """
+
+    ny, nx = ih['XLAT'].shape
+    corner = ([0, ny-1], [0, nx-1])
+
+    lat_corner = np.array(ih['XLAT'][corner], dtype=np.float64)
+    lon_corner = np.array(ih['XLONG'][corner], dtype=np.float64)
+
+    checksum = hashlib.md5(
+        lat_corner.tobytes()+lon_corner.tobytes()).hexdigest()
+
+    return '_'.join([str(ny), str(nx), checksum,
+                     str(loc['lat']), str(loc['lon'])])
+
+
+def get_time(file):
+    """Get time of a WRF output file from its file name."""
+
+    s = file.split('_')[2]+'_'+file.split('_')[3].split('.')[0]+':'\
+        + file.split('_')[4]+':'+file.split('_')[5].split('.')[0]
+
+    return datetime.strptime(s, '%Y-%m-%d_%H:%M:%S')
+
+
+def read_file(file_path, var, levels, loc, ij_cache):
+    """Read wind speed at a location at all requested heights from one
+    NetCDF file. Only the (level, i, j) points are read from u and v,
+    instead of whole horizontal planes.
+    The grid index is taken from ij_cache when the grid is known,
+    otherwise it is computed and added to ij_cache.
+    This is a module-level function, so that it can run in a process pool.
+    """
+
+    data = Dataset(file_path, 'r')
+
+    key = get_grid_key(data, loc)
+
+    if key not in ij_cache:
+        i, j = get_ij(data, loc)
+        ij_cache[key] = [int(i), int(j)]
+
+    i, j = ij_cache[key]
+
+    t = get_time(os.path.basename(file_path))
+
+    level = data['level'][:].data
+    height_ind = [np.where(level == lev)[0][0] for lev in levels]
+
+    # Hyperslab of the needed points only
+    u_all = data.variables[var[0]][height_ind, i, j]
+    v_all = data.variables[var[1]][height_ind, i, j]
+
+    # Multiply rather than power, to compute in the data type of the file
+    # as for single points (masked power promotes float32 in NumPy 2)
+    ws_all = np.sqrt(u_all*u_all + v_all*v_all)
+
+    # Bytes read from u and v, and bytes in the full planes at
+    # the same levels
+    read_bytes = u_all.nbytes + v_all.nbytes
+    plane_bytes = read_bytes * data.variables[var[0]].shape[1]\
+        * data.variables[var[0]].shape[2]
+
+    data.close()
+
+    return t, ws_all, key, [i, j], read_bytes, plane_bytes
 
 
 class wrf_netcdf:
@@ -32,6 +135,13 @@ class wrf_netcdf:
         self.freq = info['freq']
         self.flag = info['flag']
 
+        # Number of processes to read files, optional
+        self.workers = info.get('workers', 1)
+
+        # Only read files within the validation window
+        self.window = file_index.get_window(conf, self.freq)
+        self.file_num = None
+
         self.loc = conf['location']
 
         try:
@@ -39,60 +149,93 @@ class wrf_netcdf:
         except KeyError:
             self.select_method = 'instance'
 
-    # For WRF mountain wave demo case
-    def get_ij(self, ih):
-        """Return data index (i and j) for nc file at a specified target
-        location.
-        """
+        # Time series at all heights, filled by get_ts_all_levels
+        self.all_lev_df = None
 
-        lat = np.array(ih['XLAT'])
-        lon = np.array(ih['XLONG'])
+        # Cache of extracted time series between runs, optional
+        self.cache = get_series_cache(conf)
 
-        # If lat/lon were arrays (instead of matrixes)
-        # something like this would work:
-        # d = np.fromfunction(lambda x,y: (lon[x] - loc['lon'])**2
-        # + (lat[y] - loc['lat'])**2, (len(lon), len(lat)), dype=float)
+        # Only read files added or changed since the last run, optional
+        self.manifest = get_ingest_manifest(conf, info)
 
-        # This is most appropriate for Equator coordinates
-        d = (lat - self.loc['lat'])**2 + (lon - self.loc['lon'])**2
+        # Grid indices at the target location, keyed by model grid,
+        # shared between runs via a sidecar file in the cache directory
+        self.ij_file = os.path.join(
+            eval_tools.get_cache_dir(conf), 'wrf_netcdf_ij.json'
+            )
 
-        i, j = np.unravel_index(np.argmin(d), d.shape)
+        if os.path.exists(self.ij_file):
+            with open(self.ij_file) as f:
+                self.ij_cache = json.load(f)
+        else:
+            self.ij_cache = {}
 
-        return i, j
+    def save_ij_cache(self):
+        """Write grid indices to the sidecar file."""
 
-    def get_ts(self, lev):
-        """Get time series at a location at a certain height.
-        Resample data according to user-defined data frequency. 
+        # Write to a temporary file first, so that the sidecar file
+        # is never partially written
+        tmp_file = self.ij_file+'.'+str(os.getpid())+'.tmp'
+
+        with open(tmp_file, 'w') as f:
+            json.dump(self.ij_cache, f)
+
+        os.replace(tmp_file, self.ij_file)
+
+    def add_read_info(self, read_info):
+        """Add grid indices computed while reading files, which may be in
+        worker processes, and save them if there are new ones.
+        Print bytes read per file.
         """
 
-        df = pd.DataFrame({'t': [], self.target_var: []})
+        n_ij = len(self.ij_cache)
 
-        # To print an empty line before masked value error messages
-        mask_i = 0
+        for key, ij, read_bytes, plane_bytes in read_info:
+            self.ij_cache[key] = ij
 
-        for file in os.listdir(self.path):
+        if len(self.ij_cache) > n_ij:
+            self.save_ij_cache()
 
-            data = Dataset(os.path.join(self.path, file), 'r')
-            i, j = self.get_ij(data)
+        if read_info:
 
-            s = file.split('_')[2]+'_'+file.split('_')[3].split('.')[0]+':'\
-                + file.split('_')[4]+':'+file.split('_')[5].split('.')[0]
-            t = datetime.strptime(s, '%Y-%m-%d_%H:%M:%S')
+            print()
+            print('read '+str(read_bytes)+' bytes of '+', '.join(self.var)
+                  + ' per file from '+str(len(read_info))+' files, instead '
+                  + 'of '+str(plane_bytes)+' bytes in full horizontal planes')
 
-            height_ind = np.where(data['level'][:].data == lev)[0][0]
+    def get_ts_all_levels(self, levels):
+        """Get time series at a location at all requested heights,
+        opening each file only once.
+        Return a time by height data frame, which get_ts then indexes into
+        for each height.
+        """
 
-            u = data.variables[self.var[0]][height_ind][i][j]
-            v = data.variables[self.var[1]][height_ind][i][j]
-            ws = np.sqrt(u**2 + v**2)
+        # Dataset information for cached data
+        ds_info = {'path': self.path, 'var': self.var, 'levels': levels,
+                   'flag': self.flag, 'location': self.loc,
+                   'select_method': self.select_method}
+
+        # Grid indices are added to a copy while reading, and then by
+        # add_read_info, so that new ones are found in any case
+        self.all_lev_df = read_levels(
+            self, functools.partial(read_file, var=self.var, levels=levels,
+                                    loc=self.loc,
+                                    ij_cache=dict(self.ij_cache)),
+            ds_info, levels, file_regex, time_format
+            )
 
-            ws, mask_i = check_input_data.convert_mask_to_nan(ws, t, mask_i)
-            ws = check_input_data.convert_flag_to_nan(ws, self.flag, t)
+        return self.all_lev_df
 
-            data.close()
+    def get_ts(self, lev):
+        """Get time series at a location at a certain height.
+        Resample data according to user-defined data frequency.
+        """
 
-            df = df.append([{'t': t, self.target_var: ws}])
+        # Index into data already read by get_ts_all_levels
+        if self.all_lev_df is None or lev not in self.all_lev_df.columns:
+            self.get_ts_all_levels([lev])
 
-        df = df.set_index('t').sort_index()
+        df = self.all_lev_df[[lev]].rename(columns={lev: self.target_var})
 
         # Same process as in the crosscheck_ts class
         time_diff = df.index.to_series().diff()
@@ -110,8 +253,8 @@ class wrf_netcdf:
                 if self.select_method == 'instance':
                     df = df.asfreq()
 
-        df = check_input_data.verify_data_file_count(df, self.target_var,
-                                                     self.path, self.freq
-                                                     )
+        df = check_input_data.verify_data_file_count(
+            df, self.target_var, self.path, self.freq, file_num=self.file_num
+            )
 
         return df
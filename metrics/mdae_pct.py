@@ -25,4 +25,4 @@ class mdae_pct:
             print('led to undefined results '
                   + '(e.g., division by zero), are ignored.')
 
-        return float(np.median(100 * fraction_array))
+        return float(np.median(100 * fraction_array.compressed()))
@@ -18,7 +18,7 @@ def convert_mask_to_nan(var, t, mask_i):
 
     if np.ma.is_masked(var):
 
-        var = np.NaN
+        var = np.nan
 
         if mask_i == 0:
             print()
@@ -39,7 +39,7 @@ def convert_flag_to_nan(var, flag, t):
     if var == flag:
 
         print('detect flagged value at '+str(t)+', convert to NaN')
-        var = np.NaN
+        var = np.nan
 
     return var
 
@@ -85,7 +85,7 @@ def check_missing_ind_add_nan(df, t_min, t_max, freq):
     print('THEY ARE:')
     print(ideal[~with_data].strftime('%Y-%m-%d %H:%M:%S').values)
 
-    ideal_df = pd.DataFrame(data=np.NaN, columns=df.columns+'_i', index=ideal)
+    ideal_df = pd.DataFrame(data=np.nan, columns=df.columns+'_i', index=ideal)
     ideal_df.index.name = df.index.name
 
     new_df = ideal_df.join(df)
@@ -98,12 +98,17 @@ def check_missing_ind_add_nan(df, t_min, t_max, freq):
     return df
 
 
-def verify_data_file_count(df, var, path, freq, updated_len=None):
+def verify_data_file_count(df, var, path, freq, updated_len=None,
+                           file_num=None):
     """Verify the number of input data files match the user-defined,
     desired data length for analysis.
     Match actual input data frequency with user-defined data frequency.
     Check missing and duplicating values in input data.
     Return unique and continuous data for analysis.
+
+    Keyword arguments:
+    file_num -- Number of data files read, when only some of the files in
+    path are read. Its default is None, which counts all files in path.
     """
 
     t_min = df.index.min()
@@ -120,7 +125,10 @@ def verify_data_file_count(df, var, path, freq, updated_len=None):
         print('!!!!!!!!!!')
 
     # Use data file number in path as a check on data frame length
-    data_len_check = len(os.listdir(path))
+    if file_num is not None:
+        data_len_check = file_num
+    else:
+        data_len_check = len(os.listdir(path))
 
     # After check_duplicate_ind_remove is called
     if updated_len is not None:
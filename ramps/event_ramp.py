@@ -0,0 +1,174 @@
+# Event-based ramp matching
+# process_ramp compares ramps time step by time step, so a comparison ramp
+# shortly before or after a baseline ramp counts as both a false positive
+# and a false negative. Here consecutive ramp time steps are grouped into
+# ramp events, and baseline and comparison events are matched when they
+# overlap within a timing tolerance.
+#
+# Events are run-length encoded from the ramp flags, and the comparison
+# events each baseline event can match are found with np.searchsorted on
+# the (sorted) event starts and ends, so that only events close in time
+# are compared, rather than all pairs of events. Candidate pairs are then
+# matched greedily, closest first, in rounds of array operations: a pair
+# that comes first among the remaining pairs of both its baseline and its
+# comparison event is matched, as in a loop over the pairs in order, and
+# pairs of matched events are removed.
+
+import numpy as np
+import pandas as pd
+
+
+def get_events(index, flag, values):
+    """Get the data frame of ramp events, i.e. runs of consecutive time
+    steps with flag 1, with their start and end times, and magnitude,
+    the value of largest absolute value in the event.
+    A gap in the time index longer than the time step ends an event.
+    """
+
+    index = pd.DatetimeIndex(index)
+    flag = np.asarray(flag) == 1
+    values = np.asarray(values, dtype=np.float64)
+
+    # Consecutive time steps are on the smallest time step
+    contiguous = np.zeros(len(index), dtype=bool)
+    if len(index) > 1:
+        step = np.diff(index.values)
+        contiguous[1:] = step <= step.min()
+
+    # Event starts where the previous time step is not in the same event
+    follows = np.zeros(len(index), dtype=bool)
+    follows[1:] = flag[:-1] & flag[1:] & contiguous[1:]
+    is_start = flag & ~follows
+
+    # Event ends where the next time step is not in the same event
+    is_end = flag & ~np.append(follows[1:], False)
+
+    # Event number of each ramp time step
+    event_id = np.cumsum(is_start)[flag] - 1
+    event_values = values[flag]
+
+    # Largest absolute value of each event, as first after sorting
+    order = np.lexsort((-np.abs(event_values), event_id))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = event_id[order][1:] != event_id[order][:-1]
+
+    return pd.DataFrame({
+        'start': index[is_start],
+        'end': index[is_end],
+        'magnitude': event_values[order][first]
+        })
+
+
+def match_events(base_events, comp_events, tolerance):
+    """Match baseline and comparison events one to one, when the
+    comparison event overlaps the baseline event extended by tolerance
+    on both sides. Candidate pairs are matched in order of the time
+    between their starts, closest first. The number of candidate pairs
+    is the number of baseline events times the number of comparison
+    events within the tolerance of each, and the number of rounds is
+    usually small, up to the length of the longest chain of overlapping
+    candidates.
+    Return the position of the matched comparison event for each
+    baseline event, or -1 for missed events.
+    """
+
+    tolerance = pd.to_timedelta(str(tolerance))
+
+    base_start = base_events['start'].values
+    comp_start = comp_events['start'].values
+
+    # Events of a time series do not overlap, so starts and ends are both
+    # sorted, and the candidates of each baseline event are a range
+    low = np.searchsorted(comp_events['end'].values,
+                          (base_events['start'] - tolerance).values,
+                          side='left')
+    high = np.searchsorted(comp_start,
+                           (base_events['end'] + tolerance).values,
+                           side='right')
+
+    cand_num = np.maximum(high - low, 0)
+
+    # Candidate pairs, from the ranges
+    base_ind = np.repeat(np.arange(len(base_events)), cand_num)
+    comp_ind = np.arange(cand_num.sum())\
+        - np.repeat(np.cumsum(cand_num) - cand_num, cand_num)\
+        + np.repeat(low, cand_num)
+
+    distance = np.abs(comp_start[comp_ind] - base_start[base_ind])
+    order = np.argsort(distance, kind='stable')
+
+    base_ind = base_ind[order]
+    comp_ind = comp_ind[order]
+
+    match = np.full(len(base_events), -1, dtype=np.int64)
+    comp_used = np.zeros(len(comp_events), dtype=bool)
+
+    # At least the first remaining pair is matched in each round
+    while len(base_ind) > 0:
+
+        base_first = np.zeros(len(base_ind), dtype=bool)
+        base_first[np.unique(base_ind, return_index=True)[1]] = True
+        comp_first = np.zeros(len(comp_ind), dtype=bool)
+        comp_first[np.unique(comp_ind, return_index=True)[1]] = True
+
+        matched = base_first & comp_first
+        match[base_ind[matched]] = comp_ind[matched]
+        comp_used[comp_ind[matched]] = True
+
+        remain = (match[base_ind] < 0) & ~comp_used[comp_ind]
+        base_ind = base_ind[remain]
+        comp_ind = comp_ind[remain]
+
+    return match
+
+
+def get_event_table(ramp_df, base_var, comp_var, tolerance):
+    """Get event hits, misses and false alarms, event skill scores,
+    and timing (comparison minus baseline event start, in minutes)
+    and magnitude (comparison minus baseline) errors of hits.
+    """
+
+    base_events = get_events(ramp_df.index, ramp_df['base_ramp'].values,
+                             ramp_df[base_var].values)
+    comp_events = get_events(ramp_df.index, ramp_df['comp_ramp'].values,
+                             ramp_df[comp_var].values)
+
+    match = match_events(base_events, comp_events, tolerance)
+
+    hit = match >= 0
+    hit_num = int(hit.sum())
+    miss_num = len(base_events) - hit_num
+    false_alarm_num = len(comp_events) - hit_num
+
+    timing_error = (
+        comp_events['start'].values[match[hit]]
+        - base_events['start'].values[hit]
+        ) / np.timedelta64(1, 'm')
+    magnitude_error = comp_events['magnitude'].values[match[hit]]\
+        - base_events['magnitude'].values[hit]
+
+    def get_ratio(a, b):
+
+        return a/b if b > 0 else np.nan
+
+    def get_mean(v):
+
+        return v.mean() if len(v) > 0 else np.nan
+
+    return {
+        'base_event': len(base_events),
+        'comp_event': len(comp_events),
+        'event_hit': hit_num,
+        'event_miss': miss_num,
+        'event_false_alarm': false_alarm_num,
+        'event_probability_of_detection': get_ratio(
+            hit_num, len(base_events)),
+        'event_false_alarm_ratio': get_ratio(
+            false_alarm_num, len(comp_events)),
+        'event_critical_success_index': get_ratio(
+            hit_num, hit_num+miss_num+false_alarm_num),
+        'event_timing_error_minutes': get_mean(timing_error),
+        'event_abs_timing_error_minutes': get_mean(np.abs(timing_error)),
+        'event_magnitude_error': get_mean(magnitude_error),
+        'event_abs_magnitude_error': get_mean(np.abs(magnitude_error))
+        }
@@ -7,6 +7,8 @@
 import numpy as np
 import pandas as pd
 
+from ramps import event_ramp
+
 
 class process_ramp:
     """Class to process ramp results."""
@@ -14,60 +16,65 @@ class process_ramp:
     def __init__(self, ramp_df):
 
         self.df = ramp_df
+        self.event = None
 
-    def add_contingency_table(self):
+    def add_contingency_table(self, bool_cols=True):
         """Categorize ramp forecast accuracy between baseline ramps
         and comparison ramps based on a 2x2 contingency table.
+        Each time step is encoded as 2 * base_ramp + comp_ramp, i.e.
+        0: true negative, 1: false positive, 2: false negative and
+        3: true positive, and categories are counted at once.
+        Add boolean columns of the 4 categories if bool_cols is True,
+        e.g. for plotting or time series output.
         """
 
-        false_col = np.zeros(len(self.df), dtype=bool)
-        self.df['true_positive'] = false_col
-        self.df['false_positive'] = false_col
-        self.df['false_negative'] = false_col
-        self.df['true_negative'] = false_col
-
-        # self.df.loc[((self.df['base_ramp'] != 0)
-        #             & (self.df['comp_ramp'] != 0)),
-        #             ['true_positive']] = True
-        # self.df.loc[((self.df['base_ramp'] == 0)
-        #             & (self.df['comp_ramp'] != 0)),
-        #             ['false_positive']] = True
-        # self.df.loc[((self.df['base_ramp'] != 0)
-        #             & (self.df['comp_ramp'] == 0)),
-        #             ['false_negative']] = True
-        # self.df.loc[((self.df['base_ramp'] == 0)
-        #             & (self.df['comp_ramp'] == 0)),
-        #             ['true_negative']] = True
-
-        self.df.loc[((self.df['base_ramp'] == 1)
-                    & (self.df['comp_ramp'] == 1)),
-                    ['true_positive']] = True
-        self.df.loc[((self.df['base_ramp'] == 0)
-                    & (self.df['comp_ramp'] == 1)),
-                    ['false_positive']] = True
-        self.df.loc[((self.df['base_ramp'] == 1)
-                    & (self.df['comp_ramp'] == 0)),
-                    ['false_negative']] = True
-        self.df.loc[((self.df['base_ramp'] == 0)
-                    & (self.df['comp_ramp'] == 0)),
-                    ['true_negative']] = True
-
-        # Confirm that only 1 of 4 categories contains a True signal
-        # for each time step
-        for i, row in self.df.iterrows():
-            assert np.sum([row['true_positive'], row['false_positive'],
-                          row['false_negative'], row['true_negative']]) == 1
-
-        self.true_pos = self.df['true_positive'].sum()
-        self.false_pos = self.df['false_positive'].sum()
-        self.false_neg = self.df['false_negative'].sum()
-        self.true_neg = self.df['true_negative'].sum()
+        base_ramp = self.df['base_ramp'].values
+        comp_ramp = self.df['comp_ramp'].values
+
+        # Confirm that only 1 of 4 categories applies to each time step,
+        # i.e. ramps are either 0 or 1
+        assert np.isin(base_ramp, (0, 1)).all()
+        assert np.isin(comp_ramp, (0, 1)).all()
+
+        self.category = (2*base_ramp + comp_ramp).astype(np.int64)
+
+        counts = np.bincount(self.category, minlength=4)
+
+        self.true_neg = counts[0]
+        self.false_pos = counts[1]
+        self.false_neg = counts[2]
+        self.true_pos = counts[3]
 
         assert self.true_pos+self.false_pos\
                + self.false_neg+self.true_neg == len(self.df)
 
+        if bool_cols is True:
+
+            self.df['true_positive'] = self.category == 3
+            self.df['false_positive'] = self.category == 1
+            self.df['false_negative'] = self.category == 2
+            self.df['true_negative'] = self.category == 0
+
         return self.df
 
+    def add_event_table(self, base_var, comp_var, tolerance):
+        """Match baseline and comparison ramp events within a timing
+        tolerance, and count event hits, misses and false alarms.
+        """
+
+        self.event_tolerance = tolerance
+        self.event = event_ramp.get_event_table(
+            self.df, base_var, comp_var, tolerance)
+
+        return self.event
+
+    def print_event_table(self):
+        """Print event hits, misses and false alarms, and errors."""
+
+        print('ramp events matched within '+str(self.event_tolerance)+':')
+        print(pd.Series(self.event, dtype=object).to_string())
+        print()
+
     def print_contingency_table(self):
         """Print 2x2 contingency table via pandas."""
 
@@ -114,6 +121,10 @@ class process_ramp:
             'symmetric_extreme_dependency_score': self.cal_seds()
             }
 
+        # Event-based scores next to time step scores
+        if self.event is not None:
+            data.update(self.event)
+
         return pd.DataFrame.from_dict(data, orient='index')
 
     def cal_pod(self, msg=False):
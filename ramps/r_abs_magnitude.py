@@ -4,18 +4,27 @@
 # Joseph Lee <joseph.lee at pnnl.gov>
 
 import numpy as np
-import pandas as pd
+
+from ramps import ramp_cache
 
 
 class r_abs_magnitude:
 
-    def __init__(self, conf, c, ramp_data, ramps):
+    def __init__(self, conf, c, ramp_data, ramps, cache=None, lev=None):
 
         self.base_var = conf['base']['target_var']
         self.comp_var = c['target_var']
         self.ramps = ramps
         self.ramp_data = ramp_data
         self.reference = conf['reference']
+
+        # Lagged differences shared with other ramp definitions
+        # at the same level, or only used here
+        if cache is None:
+            cache = ramp_cache.ramp_cache()
+        self.cache = cache
+        self.lev = lev
+        self.c_name = c.get('name')
         self.ramp_nature = 'all'
 
     def get_rampdf(self):
@@ -28,14 +37,11 @@ class r_abs_magnitude:
               + self.ramps['duration']
               )
 
-        ramp_data_dn = self.ramp_data.copy()
-        ramp_data_dn.index = ramp_data_dn.index - pd.to_timedelta(
-            str(self.ramps['duration']))
-
         # Get data frame of lagged differences
         # Drop NA means dropping data points on both starting and ending
         # points of a ramp period
-        ramp_df = (ramp_data_dn - self.ramp_data).dropna()
+        ramp_df = self.cache.get_lagged_diff(
+            self.lev, self.c_name, self.ramp_data, self.ramps['duration'])
 
         zeros_col = np.zeros(len(ramp_df))
         ramp_df['base_ramp'] = zeros_col
@@ -5,12 +5,13 @@
 # Joseph Lee <joseph.lee at pnnl.gov>
 
 import numpy as np
-import pandas as pd
+
+from ramps import ramp_cache
 
 
 class r_magnitude:
 
-    def __init__(self, conf, c, ramp_data, ramps):
+    def __init__(self, conf, c, ramp_data, ramps, cache=None, lev=None):
 
         self.base_var = conf['base']['target_var']
         self.comp_var = c['target_var']
@@ -18,6 +19,14 @@ class r_magnitude:
         self.ramp_data = ramp_data
         self.reference = conf['reference']
 
+        # Lagged differences shared with other ramp definitions
+        # at the same level, or only used here
+        if cache is None:
+            cache = ramp_cache.ramp_cache()
+        self.cache = cache
+        self.lev = lev
+        self.c_name = c.get('name')
+
         if self.ramps['magnitude'] > 0:
             self.ramp_nature = 'up'
         elif self.ramps['magnitude'] < 0:
@@ -34,14 +43,11 @@ class r_magnitude:
               + self.ramps['duration']
               )
 
-        ramp_data_dn = self.ramp_data.copy()
-        ramp_data_dn.index = ramp_data_dn.index - pd.to_timedelta(
-            str(self.ramps['duration']))
-
         # Get data frame of lagged differences
         # Drop NA means dropping data points on both starting and ending
         # points of a ramp period
-        ramp_df = (ramp_data_dn - self.ramp_data).dropna()
+        ramp_df = self.cache.get_lagged_diff(
+            self.lev, self.c_name, self.ramp_data, self.ramps['duration'])
 
         zeros_col = np.zeros(len(ramp_df))
         ramp_df['base_ramp'] = zeros_col
@@ -0,0 +1,168 @@
+# Classify up ramp or down ramp event based on the range (maximum minus
+# minimum) within a window of a predefined duration, which captures
+# ramps that do not show between the start and end of the window.
+# The range is positive when the maximum comes after the minimum
+# (up ramp), and negative otherwise (down ramp).
+#
+# Sliding maxima and minima are computed in O(n) with the van Herk /
+# Gil-Werman algorithm: the data are split into blocks of the window
+# length, and each window is covered by the running maximum from its
+# start to the end of its block and the running maximum from the start
+# of the next block to its end.
+
+import numpy as np
+import pandas as pd
+
+
+def get_sliding_max(v, w):
+    """Get maximum and position of the (first) maximum of every window of
+    w consecutive values of v, starting at each position.
+    NaN values give NaN maxima of the windows they are in.
+    """
+
+    n = len(v)
+
+    if w > n:
+        return np.empty(0), np.empty(0, dtype=np.int64)
+
+    block_num = -(-n // w)
+    pad = block_num * w - n
+
+    v_block = np.append(v, np.full(pad, -np.inf)).reshape(block_num, w)
+    pos = np.arange(block_num * w).reshape(block_num, w)
+
+    # Running maximum from the start of each block, and position of its
+    # first occurrence, where the running maximum increases
+    prefix = np.maximum.accumulate(v_block, axis=1)
+    new_max = np.ones_like(v_block, dtype=bool)
+    new_max[:, 1:] = v_block[:, 1:] > prefix[:, :-1]
+    prefix_pos = np.maximum.accumulate(np.where(new_max, pos, -1), axis=1)
+
+    # Running maximum to the end of each block, and position of its first
+    # occurrence, where the running maximum is reached again from the end
+    suffix = np.maximum.accumulate(v_block[:, ::-1], axis=1)[:, ::-1]
+    reached = np.ones_like(v_block, dtype=bool)
+    reached[:, :-1] = v_block[:, :-1] >= suffix[:, 1:]
+    suffix_pos = np.minimum.accumulate(
+        np.where(reached, pos, block_num * w)[:, ::-1], axis=1)[:, ::-1]
+
+    prefix = prefix.ravel()
+    prefix_pos = prefix_pos.ravel()
+    suffix = suffix.ravel()
+    suffix_pos = suffix_pos.ravel()
+
+    start = np.arange(n - w + 1)
+    end = start + w - 1
+
+    first = suffix[start] >= prefix[end]
+
+    window_max = np.where(first, suffix[start], prefix[end])
+    window_pos = np.where(first, suffix_pos[start], prefix_pos[end])
+
+    # NaN is not ordered, so mark windows containing NaN
+    nan_num = np.concatenate([[0], np.cumsum(np.isnan(v))])
+    window_max = np.where(nan_num[end + 1] - nan_num[start] > 0, np.nan,
+                          window_max)
+
+    return window_max, window_pos
+
+
+def get_window_range(ramp_data, duration):
+    """Get the data frame of signed ranges within windows of duration,
+    indexed by the window start time. Data are put on a regular time
+    step, and windows with missing data are dropped.
+    """
+
+    duration = pd.to_timedelta(str(duration))
+
+    # No window in empty data, as lagged differences of empty data
+    if len(ramp_data) == 0:
+        return ramp_data.astype(np.float64)
+
+    step = pd.Timedelta(np.diff(ramp_data.index.values).min())\
+        if len(ramp_data) > 1 else duration
+
+    index = pd.date_range(ramp_data.index[0], ramp_data.index[-1],
+                          freq=step, name=ramp_data.index.name)
+    data = ramp_data.reindex(index).astype(np.float64)
+
+    # Number of time steps in a window, including both ends
+    w = int(duration // step) + 1
+
+    out = {}
+
+    for col in data.columns:
+
+        v = data[col].values
+
+        window_max, max_pos = get_sliding_max(v, w)
+        neg_min, min_pos = get_sliding_max(-v, w)
+
+        window_range = window_max + neg_min
+
+        out[col] = np.where(max_pos >= min_pos, window_range, -window_range)
+
+    # Window start times, without the frequency of the regular time step,
+    # as the index of ramp_data
+    start = pd.DatetimeIndex(index.values[:max(len(index) - w + 1, 0)],
+                             name=index.name)
+
+    ramp_df = pd.DataFrame(out, index=start)
+
+    return ramp_df.dropna()
+
+
+class r_window_range:
+
+    def __init__(self, conf, c, ramp_data, ramps):
+
+        self.base_var = conf['base']['target_var']
+        self.comp_var = c['target_var']
+        self.ramps = ramps
+        self.ramp_data = ramp_data
+        self.reference = conf['reference']
+
+        if self.ramps['magnitude'] > 0:
+            self.ramp_nature = 'up'
+        elif self.ramps['magnitude'] < 0:
+            self.ramp_nature = 'down'
+
+    def get_rampdf(self):
+        """Generate data frame with ramp classification."""
+
+        print()
+        print('classfy as '+self.ramp_nature+' ramp event when '
+              + 'the range of '+self.reference['var']
+              + ' exceeds '+str(self.ramps['magnitude'])
+              + ' '+self.reference['units']+' in a window of '
+              + self.ramps['duration']
+              )
+
+        # Get data frame of signed ranges within windows
+        ramp_df = get_window_range(self.ramp_data, self.ramps['duration'])
+
+        zeros_col = np.zeros(len(ramp_df))
+        ramp_df['base_ramp'] = zeros_col
+        ramp_df['comp_ramp'] = zeros_col
+
+        if self.ramps['magnitude'] > 0:
+
+            ramp_df.loc[ramp_df[self.base_var]
+                        > self.ramps['magnitude'], ['base_ramp']] = 1
+            ramp_df.loc[ramp_df[self.comp_var]
+                        > self.ramps['magnitude'], ['comp_ramp']] = 1
+
+        elif self.ramps['magnitude'] < 0:
+
+            ramp_df.loc[ramp_df[self.base_var]
+                        < self.ramps['magnitude'], ['base_ramp']] = 1
+            ramp_df.loc[ramp_df[self.comp_var]
+                        < self.ramps['magnitude'], ['comp_ramp']] = 1
+
+        return ramp_df
+
+    def get_ramp_method_name(self):
+        """Get ramp method name as column name in output file."""
+
+        return self.ramps['definition']+'_'+str(self.ramps['magnitude'])\
+            + self.reference['units']+'_'+self.ramps['duration']
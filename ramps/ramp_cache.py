@@ -0,0 +1,86 @@
+# Lagged differences for ramp definitions
+# A ramp definition compares data at the start and the end of a duration.
+# The lagged difference, i.e. data at t + duration minus data at t, is
+# computed with positional shifts when the time index is regular, and with
+# a sorted search of t + duration otherwise (e.g. after removing NaNs).
+#
+# ramp_cache keeps lagged differences by (level, comparison dataset,
+# duration), so that ramp definitions with the same duration at the same
+# level share one computation.
+
+import numpy as np
+import pandas as pd
+
+
+def get_lagged_diff(ramp_data, duration):
+    """Get the data frame of lagged differences over duration, indexed by
+    the start time, only for start times whose end time is in the data.
+    Drop NA means dropping data points on both starting and ending
+    points of a ramp period.
+    """
+
+    duration = pd.to_timedelta(str(duration))
+    index = ramp_data.index
+    values = ramp_data.values.astype(np.float64)
+
+    step = np.diff(index.values)
+
+    # Regular index: shift by a whole number of time steps
+    if (len(index) > 1 and (step == step[0]).all()
+            and step[0] > np.timedelta64(0)
+            and duration % pd.Timedelta(step[0]) == pd.Timedelta(0)):
+
+        k = int(duration / pd.Timedelta(step[0]))
+
+        start = index[:max(len(index) - k, 0)]
+        diff = values[k:] - values[:len(start)]
+
+    else:
+
+        pos = index.searchsorted(index + duration)
+        valid = pos < len(index)
+        valid[valid] = index[pos[valid]] == (index + duration)[valid]
+
+        start = index[valid]
+        diff = values[pos[valid]] - values[valid]
+
+    # Drop NA, as DataFrame.dropna, before making the data read-only
+    valid = ~np.isnan(diff).any(axis=1)
+    start = start[valid]
+    diff = diff[valid]
+
+    # No frequency for an empty index, as in index arithmetic
+    if len(start) == 0:
+        start = pd.DatetimeIndex(start, freq=None)
+
+    # Lagged differences are shared, so writing into them raises an error
+    # (or, with copy-on-write in pandas, copies them), while new columns
+    # can still be added
+    diff.setflags(write=False)
+
+    return pd.DataFrame(diff, index=start, columns=ramp_data.columns,
+                        copy=False)
+
+
+class ramp_cache:
+    """Cache of lagged differences by level, comparison dataset and
+    duration.
+    """
+
+    def __init__(self):
+
+        self.diff = {}
+
+    def get_lagged_diff(self, lev, c_name, ramp_data, duration):
+        """Get lagged differences over duration, computing them at the
+        first request. The returned data frame shares its read-only data
+        with the cache, so new columns can be added but existing columns
+        cannot be modified in place.
+        """
+
+        key = (lev, c_name, pd.to_timedelta(str(duration)))
+
+        if key not in self.diff:
+            self.diff[key] = get_lagged_diff(ramp_data, duration)
+
+        return self.diff[key].copy(deep=False)
@@ -0,0 +1,185 @@
+# Ramp threshold and duration sweep
+# Compute ramp skill scores for many ramp magnitudes and durations at once,
+# e.g. to tune ramp definitions, for skill score surfaces and ROC curves.
+#
+# For each duration, lagged differences are computed once. A time step is
+# a ramp when its (signed or absolute) lagged difference exceeds the
+# magnitude, and it is a true positive when the smaller of the baseline
+# and comparison differences exceeds the magnitude. Sorting the baseline,
+# comparison and smaller differences once gives the counts of the 2x2
+# contingency table for all magnitudes with np.searchsorted.
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from ramps import ramp_cache
+
+
+class sweep_ramp:
+    """Class to sweep ramp magnitudes and durations."""
+
+    def __init__(self, conf, c, ramp_data, sweep, cache=None, lev=None):
+
+        self.base_var = conf['base']['target_var']
+        self.comp_var = c['target_var']
+        self.sweep = sweep
+        self.ramp_data = ramp_data
+        self.reference = conf['reference']
+
+        # Lagged differences shared with ramp definitions at the same level
+        if cache is None:
+            cache = ramp_cache.ramp_cache()
+        self.cache = cache
+        self.lev = lev
+        self.c_name = c.get('name')
+
+        # r_magnitude: up ramps for positive magnitudes and down ramps for
+        # negative magnitudes; r_abs_magnitude: absolute changes
+        self.definition = sweep.get('definition', 'r_abs_magnitude')
+
+    def get_lagged_diff(self, duration):
+        """Get baseline and comparison lagged differences over duration,
+        as in the ramp definitions.
+        """
+
+        ramp_df = self.cache.get_lagged_diff(
+            self.lev, self.c_name, self.ramp_data, duration)
+
+        return ramp_df[self.base_var].values, ramp_df[self.comp_var].values
+
+    def get_counts(self, base, comp, magnitude):
+        """Count the 2x2 contingency table for all magnitudes at once,
+        where ramps are base > magnitude and comp > magnitude.
+        """
+
+        n = len(base)
+
+        def count_exceed(v):
+
+            return n - np.searchsorted(np.sort(v), magnitude, side='right')
+
+        base_ramp = count_exceed(base)
+        comp_ramp = count_exceed(comp)
+        true_pos = count_exceed(np.minimum(base, comp))
+
+        return pd.DataFrame({
+            'time_sample': n,
+            'base_ramp': base_ramp,
+            'comp_ramp': comp_ramp,
+            'true_positive': true_pos,
+            'false_positive': comp_ramp - true_pos,
+            'false_negative': base_ramp - true_pos,
+            'true_negative': n - base_ramp - comp_ramp + true_pos
+            })
+
+    def add_scores(self, df):
+        """Add ramp skill scores, as in process_ramp, for all rows."""
+
+        n = df['time_sample']
+        tp = df['true_positive']
+        fp = df['false_positive']
+        fn = df['false_negative']
+        tn = df['true_negative']
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+
+            df['probability_of_detection'] = np.where(
+                tp+fn > 0, tp/(tp+fn), np.nan)
+            df['critical_success_index'] = np.where(
+                tp+fp+fn > 0, tp/(tp+fp+fn), np.nan)
+            df['frequency_bias_score'] = np.where(
+                tp+fn > 0, (tp+fp)/(tp+fn), np.nan)
+            df['false_alarm_rate'] = np.where(
+                tn+fp > 0, fp/(tn+fp), np.nan)
+            df['forecast_accuracy'] = np.where(
+                tp+fp > 0, tp/(tp+fp), np.nan)
+            df['peirces_skill_score'] = df['probability_of_detection']\
+                - df['false_alarm_rate']
+            df['symmetric_extreme_dependency_score'] = np.where(
+                tp > 0, (np.log((tp+fp)/n) + np.log((tp+fn)/n))
+                / np.log(tp/n) - 1, np.nan)
+
+        return df
+
+    def get_sweepdf(self):
+        """Generate data frame of contingency tables and skill scores,
+        with one row per duration and magnitude.
+        """
+
+        magnitude = np.asarray(self.sweep['magnitude'], dtype=np.float64)
+
+        print()
+        print('sweeping '+str(len(magnitude))+' ramp magnitudes and '
+              + str(len(self.sweep['duration']))+' durations using '
+              + 'definition: '+self.definition)
+
+        out_list = []
+
+        for duration in self.sweep['duration']:
+
+            base, comp = self.get_lagged_diff(duration)
+
+            if self.definition == 'r_abs_magnitude':
+
+                nature_list = [('all', np.abs(base), np.abs(comp),
+                                magnitude)]
+
+            elif self.definition == 'r_magnitude':
+
+                # Down ramps: base < magnitude is -base > -magnitude
+                nature_list = [
+                    ('up', base, comp, magnitude[magnitude > 0]),
+                    ('down', -base, -comp, -magnitude[magnitude < 0])
+                    ]
+
+            else:
+
+                raise ValueError('ramp sweep definition must be'
+                                 + ' r_magnitude or r_abs_magnitude')
+
+            for nature, base_v, comp_v, mag in nature_list:
+
+                if len(mag) == 0:
+                    continue
+
+                count_df = self.get_counts(base_v, comp_v, mag)
+
+                if nature == 'down':
+                    mag = -mag
+
+                count_df.insert(0, 'duration', duration)
+                count_df.insert(1, 'ramp_nature', nature)
+                count_df.insert(2, 'magnitude', mag)
+
+                out_list.append(count_df)
+
+        self.sweep_df = self.add_scores(
+            pd.concat(out_list, ignore_index=True))
+
+        return self.sweep_df
+
+    def plot_roc(self, lev, lev_units):
+        """Plot ROC curves, i.e. probability of detection against false
+        alarm rate, with one curve per duration and ramp nature.
+        """
+
+        fig, ax = plt.subplots(figsize=(6, 6))
+
+        for (duration, nature), df in self.sweep_df.groupby(
+                ['duration', 'ramp_nature'], sort=False):
+
+            df = df.sort_values('false_alarm_rate')
+
+            ax.plot(df['false_alarm_rate'], df['probability_of_detection'],
+                    marker='o', label=nature+' '+str(duration))
+
+        ax.plot([0, 1], [0, 1], c='grey', ls='--')
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.set_xlabel('false alarm rate')
+        ax.set_ylabel('probability of detection')
+        ax.set_title('ramp ROC curves at '+str(lev)+' '+lev_units)
+        ax.legend()
+
+        plt.show()
@@ -0,0 +1,141 @@
+# This script runs unit tests for event_ramp.
+
+import pandas as pd
+import numpy as np
+from pandas._testing import assert_frame_equal
+
+from tools import eval_tools
+from ramps import event_ramp
+
+test_dir = 'ramps'
+
+index_eg = pd.date_range('2020-10-31 00:00', periods=12, freq='h')
+
+ramp_df_eg = pd.DataFrame({
+    'base_col': [-20, -18, 2, 2, -22, -22, 20, 21, 0, 0, 10, 10],
+    'comp_col': [2, 2, 18, 18, 0, 0, 20, 21, 0, 0, 0, 0],
+    'base_ramp': [0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 1, 1],
+    'comp_ramp': [0, 0, 1, 1, 0, 0, 1, 1, 0, 0, 0, 0],
+    }, index=index_eg).astype(float)
+
+
+def test_get_events():
+
+    events = event_ramp.get_events(
+        ramp_df_eg.index, ramp_df_eg['base_ramp'], ramp_df_eg['base_col'])
+
+    events_eg = pd.DataFrame({
+        'start': index_eg[[6, 10]],
+        'end': index_eg[[7, 11]],
+        'magnitude': [21., 10.]
+        })
+
+    assert_frame_equal(events, events_eg)
+
+
+def test_get_events_gap():
+
+    # Missing time steps split consecutive ramp time steps into 2 events
+    df = ramp_df_eg.drop(index_eg[[8, 9]])
+
+    events = event_ramp.get_events(df.index, df['base_ramp'],
+                                   df['base_col'])
+
+    assert list(events['start']) == list(index_eg[[6, 10]])
+    assert list(events['end']) == list(index_eg[[7, 11]])
+
+
+def test_get_event_table():
+
+    event = event_ramp.get_event_table(ramp_df_eg, 'base_col', 'comp_col',
+                                       '0 minutes')
+
+    assert event['event_hit'] == 1
+    assert event['event_miss'] == 1
+    assert event['event_false_alarm'] == 1
+    assert event['event_timing_error_minutes'] == 0
+    assert event['event_magnitude_error'] == 0
+
+
+def test_match_events_tolerance():
+
+    base_events = pd.DataFrame({
+        'start': pd.to_datetime(['2020-10-31 01:00', '2020-10-31 06:00']),
+        'end': pd.to_datetime(['2020-10-31 02:00', '2020-10-31 07:00']),
+        'magnitude': [5., 5.]
+        })
+
+    # Late by 30 minutes, and a false alarm
+    comp_events = pd.DataFrame({
+        'start': pd.to_datetime(['2020-10-31 02:30', '2020-10-31 04:00',
+                                 '2020-10-31 06:30']),
+        'end': pd.to_datetime(['2020-10-31 03:00', '2020-10-31 04:00',
+                               '2020-10-31 07:30']),
+        'magnitude': [5., 5., 5.]
+        })
+
+    match = event_ramp.match_events(base_events, comp_events, '0 minutes')
+    np.testing.assert_array_equal(match, [-1, 2])
+
+    match = event_ramp.match_events(base_events, comp_events, '30 minutes')
+    np.testing.assert_array_equal(match, [0, 2])
+
+    # The closest candidate is matched first
+    match = event_ramp.match_events(base_events, comp_events, '3 hours')
+    np.testing.assert_array_equal(match, [0, 2])
+
+
+def match_events_loop(base_events, comp_events, tolerance):
+    """Match all pairs of events one at a time, closest first."""
+
+    tolerance = pd.to_timedelta(tolerance)
+
+    pairs = []
+
+    for i, b in base_events.iterrows():
+        for j, c in comp_events.iterrows():
+            if c['end'] >= b['start'] - tolerance\
+                    and c['start'] <= b['end'] + tolerance:
+                pairs.append((abs(c['start'] - b['start']), i, j))
+
+    match = np.full(len(base_events), -1)
+
+    for _, i, j in sorted(pairs, key=lambda p: p[0]):
+        if match[i] < 0 and j not in match:
+            match[i] = j
+
+    return match
+
+
+def test_match_events_greedy():
+
+    rng = np.random.RandomState(0)
+
+    for run in range(5):
+
+        index = pd.date_range('2020-10-31 00:00', periods=100, freq='10min')
+
+        base_events = event_ramp.get_events(
+            index, rng.rand(100) < 0.3, rng.rand(100))
+        comp_events = event_ramp.get_events(
+            index, rng.rand(100) < 0.3, rng.rand(100))
+
+        for tolerance in ['0 minutes', '30 minutes', '2 hours']:
+
+            np.testing.assert_array_equal(
+                event_ramp.match_events(base_events, comp_events, tolerance),
+                match_events_loop(base_events, comp_events, tolerance))
+
+
+def test_generate_ramp_summary_df():
+
+    process_ramp = eval_tools.get_module_class(test_dir, 'process_ramp')(
+        ramp_df_eg.copy())
+    process_ramp.add_contingency_table()
+    process_ramp.add_event_table('base_col', 'comp_col', '2 hours')
+
+    summary = process_ramp.generate_ramp_summary_df()[0]
+
+    assert summary['true_positive'] == 2
+    assert summary['event_hit'] == 1
+    assert summary['event_false_alarm'] == 1
@@ -0,0 +1,155 @@
+# This script runs unit tests for r_window_range.
+# Test for up ramps and down ramps.
+
+import pandas as pd
+import numpy as np
+from pandas._testing import assert_frame_equal
+
+from tools import eval_tools
+from ramps.r_window_range import get_sliding_max
+
+test_dir = 'ramps'
+
+conf_eg = {'base': {'target_var': 'base_col'},
+           'reference': {'var': 'wind speed', 'units': 'ms-1'},
+           'levels': {'height_units': 'm'}
+           }
+
+ramps_up_eg = {'definition': 'r_window_range', 'duration': '2 hours',
+               'magnitude': 2}
+ramps_down_eg = {'definition': 'r_window_range', 'duration': '2 hours',
+                 'magnitude': -2}
+
+c_eg = {'target_var': 'comp_col'}
+
+index_eg = pd.to_datetime(pd.Series(
+    ['2020-10-31 00:00', '2020-10-31 01:00',
+     '2020-10-31 02:00', '2020-10-31 03:00',
+     '2020-10-31 04:00', '2020-10-31 05:00',
+     '2020-10-31 06:00', '2020-10-31 07:00',
+     '2020-10-31 08:00', '2020-10-31 09:00',
+     '2020-10-31 10:00', '2020-10-31 11:00',
+     '2020-10-31 12:00', '2020-10-31 13:00']))
+
+data_eg = {
+    'base_col': [60, 59, 40, 41, 42, 43, 20, 21, 40, 42, 40, 42, 50, 52],
+    'comp_col': [20, 21, 22, 23, 40, 41, 40, 41, 60, 62, 60, 62, 60, 62],
+}
+ramp_data_eg = pd.DataFrame(data_eg, index=index_eg)
+
+# Signed range within 3 hourly values, e.g. 60, 59, 40 gives -20
+# (and not -18 as between both ends)
+ramp_df_eg = ramp_data_eg.copy()
+ramp_df_eg = ramp_df_eg.iloc[:-2].astype(float)
+ramp_df_eg['base_col'] = np.array(
+    [-20, -19, 2, 2, -23, -23, 20, 21, 2, -2, 10, 10], float
+    )
+ramp_df_eg['comp_col'] = np.array(
+    [2, 2, 18, 18, 1, -1, 20, 21, 2, -2, 2, -2], float
+    )
+
+ramp_up_df_eg = ramp_df_eg.copy()
+ramp_up_df_eg['base_ramp'] = np.array(
+    [0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 1, 1], float)
+ramp_up_df_eg['comp_ramp'] = np.array(
+    [0, 0, 1, 1, 0, 0, 1, 1, 0, 0, 0, 0], float)
+
+ramp_down_df_eg = ramp_df_eg.copy()
+ramp_down_df_eg['base_ramp'] = np.array(
+    [1, 1, 0, 0, 1, 1, 0, 0, 0, 0, 0, 0], float)
+ramp_down_df_eg['comp_ramp'] = np.zeros(12)
+
+
+def read_ramp(ramp_method):
+
+    return eval_tools.get_module_class(test_dir, ramp_method)
+
+
+def test_r_window_range_up():
+
+    r = read_ramp('r_window_range')(conf_eg, c_eg, ramp_data_eg, ramps_up_eg)
+
+    assert_frame_equal(r.get_rampdf(), ramp_up_df_eg)
+
+
+def test_r_window_range_down():
+
+    r = read_ramp('r_window_range')(conf_eg, c_eg, ramp_data_eg,
+                                    ramps_down_eg)
+
+    assert_frame_equal(r.get_rampdf(), ramp_down_df_eg)
+
+
+def test_r_window_range_gap():
+
+    # Windows with a missing time step are dropped
+    r = read_ramp('r_window_range')(conf_eg, c_eg,
+                                    ramp_data_eg.drop(index_eg[3]),
+                                    ramps_up_eg)
+
+    assert_frame_equal(r.get_rampdf(),
+                       ramp_up_df_eg.drop(index_eg[[1, 2, 3]]))
+
+
+def test_add_contingency_table():
+
+    process_ramp = read_ramp('process_ramp')(ramp_up_df_eg.copy())
+    process_ramp.add_contingency_table()
+
+    assert process_ramp.true_pos == 2
+    assert process_ramp.false_pos == 2
+    assert process_ramp.false_neg == 2
+    assert process_ramp.true_neg == 6
+
+
+def test_r_window_range_empty():
+
+    r = read_ramp('r_window_range')(conf_eg, c_eg, ramp_data_eg.iloc[:0],
+                                    ramps_up_eg)
+
+    ramp_df = r.get_rampdf()
+
+    assert len(ramp_df) == 0
+    assert list(ramp_df.columns) == list(ramp_up_df_eg.columns)
+
+
+def get_windows(v, w):
+
+    return np.array([v[i:i+w] for i in range(len(v)-w+1)])
+
+
+def test_sliding_max():
+
+    rng = np.random.RandomState(0)
+    v = rng.randint(0, 5, 50).astype(float)
+
+    for w in [1, 3, 7, 50]:
+
+        window_max, window_pos = get_sliding_max(v, w)
+
+        windows = get_windows(v, w)
+
+        np.testing.assert_array_equal(window_max, windows.max(axis=1))
+        np.testing.assert_array_equal(
+            window_pos, np.arange(len(windows)) + windows.argmax(axis=1))
+
+
+def test_sliding_max_nan():
+
+    # Windows containing NaN give NaN maxima
+    v = np.array([1, 3, np.nan, 2, 5, 4, 0, 1], float)
+
+    for w in [1, 2, 3]:
+
+        window_max, window_pos = get_sliding_max(v, w)
+
+        windows = get_windows(v, w)
+        has_nan = np.isnan(windows).any(axis=1)
+
+        assert (np.isnan(window_max) == has_nan).all()
+        np.testing.assert_array_equal(
+            window_max[~has_nan], windows[~has_nan].max(axis=1))
+        np.testing.assert_array_equal(
+            window_pos[~has_nan],
+            np.arange(len(windows))[~has_nan]
+            + windows[~has_nan].argmax(axis=1))
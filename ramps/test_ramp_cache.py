@@ -0,0 +1,66 @@
+# This script runs unit tests for ramp_cache.
+
+import pandas as pd
+import numpy as np
+from pandas._testing import assert_frame_equal
+
+from ramps import ramp_cache
+
+index_eg = pd.date_range('2020-10-31', periods=20, freq='10min')
+ramp_data_eg = pd.DataFrame(
+    {'base_col': np.arange(20)**2, 'comp_col': np.arange(20)*3},
+    index=index_eg)
+
+
+def get_lagged_diff_reindex(ramp_data, duration):
+    """Lagged differences via index arithmetic."""
+
+    ramp_data_dn = ramp_data.copy()
+    ramp_data_dn.index = ramp_data_dn.index - pd.to_timedelta(duration)
+
+    return (ramp_data_dn - ramp_data).dropna()
+
+
+def test_get_lagged_diff():
+
+    # Regular index, and irregular index after removing NaN rows
+    for ramp_data in [ramp_data_eg, ramp_data_eg.drop(index_eg[[2, 7, 8]])]:
+        for duration in ['10 minutes', '30 minutes', '1 hour']:
+
+            assert_frame_equal(
+                ramp_cache.get_lagged_diff(ramp_data, duration),
+                get_lagged_diff_reindex(ramp_data, duration))
+
+
+def test_ramp_cache():
+
+    cache = ramp_cache.ramp_cache()
+
+    df = cache.get_lagged_diff(40, 'wrf', ramp_data_eg, '1 hour')
+    df['base_ramp'] = 1.
+
+    # Same duration in other units, from the cache
+    df_2 = cache.get_lagged_diff(40, 'wrf', None, '60 minutes')
+
+    assert len(cache.diff) == 1
+    assert list(df_2.columns) == ['base_col', 'comp_col']
+    assert_frame_equal(df_2, get_lagged_diff_reindex(ramp_data_eg, '1 hour'))
+
+
+def test_ramp_cache_read_only():
+
+    cache = ramp_cache.ramp_cache()
+
+    df = cache.get_lagged_diff(40, 'wrf', ramp_data_eg, '1 hour')
+
+    assert not df.values.flags.writeable
+
+    # Writing into an existing column raises an error, or with
+    # copy-on-write in pandas, only changes the returned data frame
+    try:
+        df.loc[df['base_col'] > 100, 'base_col'] = -1.
+    except ValueError:
+        pass
+
+    assert_frame_equal(cache.get_lagged_diff(40, 'wrf', None, '1 hour'),
+                       get_lagged_diff_reindex(ramp_data_eg, '1 hour'))
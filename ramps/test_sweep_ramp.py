@@ -0,0 +1,77 @@
+# This script runs unit tests for sweep_ramp.
+# Compare with ramp definitions and process_ramp for each combination
+# of ramp magnitude and duration.
+
+import pandas as pd
+import numpy as np
+
+from tools import eval_tools
+
+test_dir = 'ramps'
+
+conf_eg = {'base': {'target_var': 'base_col'},
+           'reference': {'var': 'wind speed', 'units': 'ms-1'}
+           }
+
+c_eg = {'target_var': 'comp_col'}
+
+rng = np.random.default_rng(0)
+index_eg = pd.date_range('2020-10-31', periods=500, freq='10min')
+ramp_data_eg = pd.DataFrame(
+    {'base_col': np.cumsum(rng.normal(0, 1, 500)),
+     'comp_col': np.cumsum(rng.normal(0, 1, 500))}, index=index_eg)
+
+summary_cols = ['time_sample', 'base_ramp', 'comp_ramp', 'true_positive',
+                'false_positive', 'false_negative', 'true_negative',
+                'probability_of_detection', 'critical_success_index',
+                'frequency_bias_score', 'false_alarm_rate',
+                'forecast_accuracy', 'peirces_skill_score',
+                'symmetric_extreme_dependency_score']
+
+
+def read_ramp(ramp_method):
+
+    return eval_tools.get_module_class(test_dir, ramp_method)
+
+
+def assert_sweep(definition, magnitude, duration):
+
+    sweep = {'definition': definition, 'magnitude': magnitude,
+             'duration': duration}
+
+    sweep_df = read_ramp('sweep_ramp')(
+        conf_eg, c_eg, ramp_data_eg, sweep).get_sweepdf()
+
+    assert len(sweep_df) == len(magnitude) * len(duration)
+
+    for d in duration:
+        for m in magnitude:
+
+            ramps = {'definition': definition, 'magnitude': m,
+                     'duration': d}
+
+            ramp_df = read_ramp(definition)(
+                conf_eg, c_eg, ramp_data_eg, ramps).get_rampdf()
+
+            process_ramp = read_ramp('process_ramp')(ramp_df)
+            process_ramp.add_contingency_table()
+
+            expected = process_ramp.generate_ramp_summary_df()[0]
+
+            row = sweep_df[(sweep_df['duration'] == d)
+                           & (sweep_df['magnitude'] == m)].iloc[0]
+
+            np.testing.assert_allclose(
+                row[summary_cols].values.astype(float),
+                expected[summary_cols].values.astype(float))
+
+
+def test_sweep_abs_magnitude():
+
+    assert_sweep('r_abs_magnitude', [0.5, 1, 2, 4, 20],
+                 ['10 minutes', '1 hour'])
+
+
+def test_sweep_magnitude():
+
+    assert_sweep('r_magnitude', [-3, -1, 1, 3], ['30 minutes', '2 hours'])
@@ -0,0 +1,86 @@
+# This script benchmarks building a time series in input parsers:
+# appending rows to a data frame one by one (as the input parsers used to
+# do with DataFrame.append) versus the preallocated ts_builder.
+#
+# Run from the repo root:
+# $ python -m tools.benchmark_ts_builder
+#
+# Row-by-row appending is quadratic in the number of files, so by default
+# it is only timed up to 10k rows. Use --full to time it at every size.
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from tools.ts_builder import ts_builder
+
+sizes = [10000, 100000, 500000]
+append_max = 10000
+
+
+def get_example(n):
+    """Generate n time stamps and values, 10-minute data at 3 heights."""
+
+    t = pd.date_range('2016-09-23', periods=n, freq='10min').to_pydatetime()
+    values = np.random.default_rng(0).random((n, 3))
+
+    return t, values
+
+
+def build_append(t, values):
+    """Append one row at a time to a data frame.
+    DataFrame.append was removed in pandas 2, and it was implemented as
+    a concat of the new row, so concat is used here.
+    """
+
+    df = pd.DataFrame({'t': [], 40: [], 80: [], 120: []})
+
+    for t_i, v_i in zip(t, values):
+
+        row = pd.DataFrame([{'t': t_i, 40: v_i[0], 80: v_i[1], 120: v_i[2]}])
+        df = pd.concat([df, row])
+
+    return df.set_index('t').sort_index()
+
+
+def build_ts_builder(t, values):
+    """Collect rows with ts_builder, then build the data frame once."""
+
+    ts = ts_builder([40, 80, 120], size=len(t))
+
+    for t_i, v_i in zip(t, values):
+
+        ts.add(t_i, v_i)
+
+    return ts.get_df()
+
+
+def run(full=False):
+
+    print('rows, DataFrame append (s), ts_builder (s)')
+
+    for n in sizes:
+
+        t, values = get_example(n)
+
+        start = time.perf_counter()
+        build_ts_builder(t, values)
+        builder_sec = time.perf_counter() - start
+
+        if full or n <= append_max:
+
+            start = time.perf_counter()
+            build_append(t, values)
+            append_txt = str(np.round(time.perf_counter() - start, 3))
+
+        else:
+
+            append_txt = 'skipped'
+
+        print(str(n)+', '+append_txt+', '+str(np.round(builder_sec, 3)))
+
+
+if __name__ == '__main__':
+
+    run(full='--full' in sys.argv)
@@ -0,0 +1,145 @@
+# This script computes metrics conditioned on the baseline wind regime,
+# as set in the binning section of the configuration:
+#   ws_bins: wind speed bin edges as [start, stop, step], or power_curve
+#       to use the wind speeds of the power curve file as bin edges
+#       (of the first turbine type if only a fleet is declared)
+#   sectors: number of wind direction sectors, for wind direction
+#
+# Each time step is given a bin with np.digitize, and all bins are
+# computed in one pass with metric_kernel.compute_grouped.
+#
+# When bin edges come from the power curve, the slope of the power curve
+# in each bin is added, so that e.g. bias in a bin times power_slope
+# gives the corresponding power error.
+
+import os
+import pathlib
+import numpy as np
+import pandas as pd
+
+from tools import eval_tools, metric_kernel
+
+
+def read_power_curve(conf):
+    """Return the wind speed and power of the power curve file.
+    With only a fleet of turbine types, use the power curve of the first
+    turbine type in the fleet file.
+    """
+
+    p_curve = conf.get('power_curve', {})
+
+    path = os.path.join((pathlib.Path(os.getcwd()).parent),
+                        str(p_curve.get('path')))
+
+    if 'file' in p_curve:
+        file = p_curve['file']
+    elif 'fleet' in p_curve:
+        file = pd.read_csv(os.path.join(path, p_curve['fleet']))['file'][0]
+    else:
+        raise ValueError('binning: ws_bins: power_curve needs a power curve'
+                         + ' file or fleet in the power_curve section')
+
+    pc_df = pd.read_csv(os.path.join(path, file))
+
+    return pc_df[p_curve['ws']].values, pc_df[p_curve['power']].values
+
+
+def get_ws_edges(conf):
+    """Return wind speed bin edges."""
+
+    ws_bins = conf['binning'].get('ws_bins', [0, 26, 1])
+
+    if ws_bins == 'power_curve':
+        return np.unique(read_power_curve(conf)[0])
+
+    start, stop, step = ws_bins
+
+    return np.arange(start, stop + step/2, step)
+
+
+def get_power_slope(edges, conf):
+    """Return the slope of the power curve in each bin."""
+
+    curve_ws, curve_power = read_power_curve(conf)
+
+    power = eval_tools.get_power_from_curve(edges, curve_ws, curve_power,
+                                            method='linear')
+
+    return np.diff(power) / np.diff(edges)
+
+
+def get_sector_bins(wd, sectors):
+    """Return the sector of each wind direction, sector 0 being centred on
+    north, and the lower and upper bounds of each sector.
+    """
+
+    width = 360 / sectors
+
+    g = (np.asarray(wd, dtype=np.float64) + width/2) % 360 // width
+    g = np.where(np.isnan(g), sectors, g).astype(np.int64)
+
+    centre = np.arange(sectors) * width
+
+    return g, (centre - width/2) % 360, centre + width/2
+
+
+def get_metrics(x_base, x, y, metrics, conf, nature):
+    """Compute metrics by bin of the baseline data x_base, i.e. wind speed
+    bins if nature is ws and direction sectors if nature is wd,
+    for x and y, the baseline and compare data used in metrics.
+    metrics is a list of metric class instances, of which those not in
+    metric_kernel are computed by their classes for each bin.
+    Return a tidy data frame, with one row per bin and metric,
+    or None for other natures.
+    """
+
+    x_base = np.asarray(x_base, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    if nature == 'ws':
+
+        edges = get_ws_edges(conf)
+        low = edges[:-1]
+        high = edges[1:]
+
+        # Values out of all bins go to a last, dropped group
+        g = np.digitize(x_base, edges) - 1
+        g = np.where((g < 0) | (g >= len(low)) | np.isnan(x_base),
+                     len(low), g)
+
+    elif nature == 'wd':
+
+        g, low, high = get_sector_bins(x_base, conf['binning'].get('sectors',
+                                                                   12))
+
+    else:
+
+        return None
+
+    names = [m.__class__.__name__ for m in metrics]
+
+    n = np.bincount(g, minlength=len(low)+1)[:len(low)]
+
+    binned = metric_kernel.compute_grouped(
+        x, y, g, len(low)+1, names, verbose=False
+        )
+
+    bin_df = pd.DataFrame({'low': low, 'high': high, 'n': n})
+
+    if nature == 'ws' and conf['binning'].get('ws_bins') == 'power_curve':
+        bin_df['power_slope'] = get_power_slope(edges, conf)
+
+    out_list = []
+
+    for m, name in zip(metrics, names):
+
+        if name in binned:
+            values = binned[name][:len(low)]
+        else:
+            values = [m.compute(x[g == i], y[g == i]) if n[i] > 0
+                      else np.nan for i in range(len(low))]
+
+        out_list.append(bin_df.assign(metric=name, value=values))
+
+    return pd.concat(out_list, ignore_index=True)
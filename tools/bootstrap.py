@@ -0,0 +1,90 @@
+# This script computes block bootstrap confidence intervals of metrics.
+#
+# Time series are resampled in blocks of consecutive time steps (moving
+# block bootstrap), to keep their autocorrelation within blocks. The
+# resampled time steps of all replicates form one (n_boot x n) index
+# matrix, which is evaluated with metric_kernel along its last axis,
+# a chunk of replicates at a time so that memory use stays bounded.
+#
+# Options in the bootstrap section of the configuration:
+#   n_boot: number of replicates, default 1000
+#   block: block length in time steps, default 144 (1 day of 10-min data)
+#   ci: confidence level in %, default 95
+#   seed: random seed, default 0
+#   max_mb: approximate memory limit of a chunk in MB, default 200
+
+import numpy as np
+
+from tools import metric_kernel
+
+# Approximate number of (replicate x time) float64 arrays held at once
+# when evaluating a chunk of replicates
+array_num = 12
+
+
+def get_block_index(n, block, n_boot, rng):
+    """Return an (n_boot x n) index matrix of moving block resamples
+    of n time steps.
+    """
+
+    block = max(1, min(block, n))
+    block_num = -(-n // block)
+
+    starts = rng.integers(0, n - block + 1, size=(n_boot, block_num))
+
+    index = starts[:, :, np.newaxis] + np.arange(block)
+
+    return index.reshape(n_boot, -1)[:, :n]
+
+
+def get_ci(x, y, metrics, boot_conf):
+    """Compute confidence intervals of metrics for baseline x and compare
+    y, with the options in boot_conf.
+    metrics is a list of metric class instances, and metrics that are not
+    in metric_kernel are computed by their classes for each replicate.
+    Return a dictionary of metric names and (lower, upper) bounds.
+    """
+
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+
+    n_boot = boot_conf.get('n_boot', 1000)
+    block = boot_conf.get('block', 144)
+    ci = boot_conf.get('ci', 95)
+    max_mb = boot_conf.get('max_mb', 200)
+
+    rng = np.random.default_rng(boot_conf.get('seed', 0))
+
+    names = [m.__class__.__name__ for m in metrics]
+
+    if len(x) == 0:
+        return {name: (np.nan, np.nan) for name in names}
+
+    chunk = max(1, int(max_mb * 1e6 / (len(x) * 8 * array_num)))
+
+    boot = {name: np.empty(n_boot) for name in names}
+
+    for start in range(0, n_boot, chunk):
+
+        size = min(chunk, n_boot - start)
+
+        index = get_block_index(len(x), block, size, rng)
+
+        x_boot = x[index]
+        y_boot = y[index]
+
+        fused = metric_kernel.compute(x_boot, y_boot, names, verbose=False)
+
+        for m, name in zip(metrics, names):
+
+            if name in fused:
+                boot[name][start:start+size] = fused[name]
+            else:
+                boot[name][start:start+size] = [
+                    m.compute(x_i, y_i) for x_i, y_i in zip(x_boot, y_boot)
+                    ]
+
+    q = [(100 - ci) / 2, 100 - (100 - ci) / 2]
+
+    return {name: tuple(float(b) for b in np.nanpercentile(val, q))
+            for name, val in boot.items()}
@@ -2,7 +2,7 @@
 
 import numpy as np
 import itertools
-from tools import eval_tools
+from tools import eval_tools, metric_kernel, bootstrap, stratify, binning
 import sys
 
 
@@ -28,12 +28,15 @@ def remove_na(combine_df, ramp_txt=False):
     return compute_df
 
 
-def run(combine_df, metrics, results, ind, c, conf, base, lev):
+def run(combine_df, metrics, results, ind, c, conf, base, lev,
+        binned=True):
     """Calculate metrics and print results.
     Remove NaNs in data frame.
     For each data column combination, split into baseline and
     compare data series.
     Calculate and print metrics, as listed in the yaml file.
+    Set binned to False when the data are not of the baseline nature,
+    e.g. derived power, to skip metrics by wind speed bin.
     """
 
     compute_df = remove_na(combine_df)
@@ -46,6 +49,9 @@ def run(combine_df, metrics, results, ind, c, conf, base, lev):
         x = compute_df[pair[0]]
         y = compute_df[pair[1]]
 
+        # Baseline data before wind direction differences
+        x_base = x
+
         if len(x) != len(y):
 
             sys.exit('Lengths of baseline and compare datasets are'
@@ -62,9 +68,40 @@ def run(combine_df, metrics, results, ind, c, conf, base, lev):
             # x as baseline, is set to zero
             x = np.zeros(len(y))
 
+        # Compute built-in metrics at once, others by their own classes
+        fused = metric_kernel.compute(
+            x, y, [m.__class__.__name__ for m in metrics]
+            )
+
         for m in metrics:
 
-            results[ind][m.__class__.__name__] = m.compute(x, y)
+            name = m.__class__.__name__
+
+            if name in fused:
+                results[ind][name] = fused[name]
+            else:
+                results[ind][name] = m.compute(x, y)
+
+        # Block bootstrap confidence intervals
+        if 'bootstrap' in conf:
+
+            results[ind]['ci'] = bootstrap.get_ci(
+                x, y, metrics, conf['bootstrap']
+                )
+
+        # Metrics by hour of day, month or season
+        if 'stratify' in conf:
+
+            results[ind]['stratified'] = stratify.get_metrics(
+                compute_df.index, x, y, metrics, conf['stratify']
+                )
+
+        # Metrics by baseline wind speed bin or wind direction sector
+        if 'binning' in conf and binned is True:
+
+            results[ind]['binned'] = binning.get_metrics(
+                x_base, x, y, metrics, conf, base['nature']
+                )
 
         print()
         print('==-- '+conf['reference']['var']+' metrics: '+c['name']
@@ -83,4 +120,13 @@ def run(combine_df, metrics, results, ind, c, conf, base, lev):
                 if str(key).endswith(suffix_pct):
                     end_units = '%'
 
-                print(str(key)+': '+str(np.round(val, 3))+end_units)
+                ci_txt = ''
+
+                if key in results[ind].get('ci', {}):
+
+                    low, high = results[ind]['ci'][key]
+                    ci_txt = ' ('+str(conf['bootstrap'].get('ci', 95))\
+                        + '% CI: '+str(np.round(low, 3))+end_units\
+                        + ' to '+str(np.round(high, 3))+end_units+')'
+
+                print(str(key)+': '+str(np.round(val, 3))+end_units+ci_txt)
@@ -1,6 +1,9 @@
 # This script contains tools for the codebase.
 
+import os
+import pathlib
 import importlib
+import concurrent.futures
 import math
 import numpy as np
 
@@ -13,6 +16,43 @@ def get_module_class(d, c):
     return getattr(m, c)
 
 
+def get_cache_dir(conf):
+    """Return the directory for cached files, and create it if needed.
+    Use cache: path: in the configuration if it is declared,
+    otherwise use the cache directory in the repo.
+    """
+
+    try:
+        cache_path = conf['cache']['path']
+    except (KeyError, TypeError):
+        cache_path = 'cache'
+
+    cache_dir = os.path.join((pathlib.Path(os.getcwd()).parent), cache_path)
+
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+
+    return cache_dir
+
+
+def map_files(func, file_list, workers=1):
+    """Apply func to each file in file_list.
+    Spread the files across a process pool when workers is larger than 1.
+    Results are returned in the order of file_list.
+    """
+
+    if workers is None or workers <= 1 or len(file_list) <= 1:
+
+        return [func(file) for file in file_list]
+
+    # Send files to workers in chunks to reduce communication overhead
+    chunksize = max(1, len(file_list) // (workers * 4))
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as ex:
+
+        return list(ex.map(func, file_list, chunksize=chunksize))
+
+
 def apply_trans(ts, modlist):
     """Apply a series of transformative modules."""
 
@@ -57,15 +97,147 @@ def calculate_angle_diff(x_i, y_i):
     return angle
 
 
+def get_wd_angle_diff(x, y, signed=False):
+    """Calculate angle differences between two arrays of wind directions,
+    in degrees, as calculate_angle_diff does for single values.
+    Wind directions are converted into u and v unit vectors, and the
+    cosine of the angle between them is clipped to [-1, 1] so that
+    rounding does not yield NaN.
+
+    :param bool signed: if True, return differences from x to y
+        between -180 and 180, positive when y is clockwise from x
+    """
+
+    x = np.radians(np.asarray(x, dtype=np.float64))
+    y = np.radians(np.asarray(y, dtype=np.float64))
+
+    u_x = -np.sin(x)
+    v_x = -np.cos(x)
+
+    u_y = -np.sin(y)
+    v_y = -np.cos(y)
+
+    cos_angle = np.clip(u_x*u_y + v_x*v_y, -1, 1)
+
+    angle = np.where((u_x == u_y) & (v_x == v_y), 0.,
+                     np.degrees(np.arccos(cos_angle)))
+
+    if signed:
+
+        # Sign of the cross product of the unit vectors
+        cross = v_x*u_y - u_x*v_y
+
+        angle = np.where(cross < 0, -angle, angle)
+
+    return angle
+
+
 def get_wd_angle_diff_series(x, y):
     """Convert x and y time series into one series of wind direction
     difference in degrees.
     """
 
-    angle_series = np.empty(len(x))
+    return get_wd_angle_diff(x, y)
+
+
+def get_power_from_curves(ws, curves, method='step'):
+    """Convert wind speed into power for several power curves at once.
+    ws is an array of any shape, whose last axis has one column per power
+    curve, and curves is a list of (curve wind speed, curve power) pairs.
+
+    All power curves are stacked into one lookup array, sorted by curve
+    and then by wind speed, which is searched once for all curves.
+
+    :param str step: power of the highest power curve wind speed
+        exceeded, i.e. 0 below the power curve, the same as assigning the
+        power of each power curve row in turn when wind speed exceeds it
+    :param str linear: linear interpolation between power curve points,
+        0 below the power curve and the last power above it
+
+    NaN wind speed gives NaN power.
+    """
+
+    ws = np.asarray(ws, dtype=np.float64)
+
+    curve_id = np.concatenate([np.full(len(c[0]), k)
+                               for k, c in enumerate(curves)])
+    curve_ws = np.concatenate([np.asarray(c[0], dtype=np.float64)
+                               for c in curves])
+    curve_power = np.concatenate([np.asarray(c[1], dtype=np.float64)
+                                  for c in curves])
+
+    # Complex numbers are sorted by real part and then imaginary part,
+    # so curve number + 1j * wind speed is an exact key for all curves
+    key = curve_id + 1j*curve_ws
+    order = np.argsort(key, kind='stable')
+    sorted_key = key[order]
+    sorted_ws = curve_ws[order]
+    sorted_power = curve_power[order]
+
+    # First and last positions of each curve in the lookup array
+    k = np.arange(len(curves))
+    first = np.searchsorted(curve_id[order], k, side='left')
+    last = np.searchsorted(curve_id[order], k, side='right') - 1
+
+    query = k + 1j*ws
+
+    if method == 'step':
+
+        # Last power curve point exceeded
+        ind = np.searchsorted(sorted_key, query, side='left') - 1
+        ind = np.clip(ind, 0, len(sorted_key)-1)
+
+        # For an unsorted power curve, the last exceeded row in file order
+        # is kept, as in a row-by-row assignment
+        last_row = np.maximum.accumulate(order)
+
+        power = np.where(ws > sorted_ws[first], curve_power[last_row[ind]],
+                         0.)
+
+    elif method == 'linear':
+
+        # Power curve points on both sides of wind speed
+        lo = np.searchsorted(sorted_key, query, side='right') - 1
+        lo = np.clip(lo, first, last)
+        hi = np.minimum(lo+1, last)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frac = np.where(hi > lo, (ws - sorted_ws[lo])
+                            / (sorted_ws[hi] - sorted_ws[lo]), 0.)
+
+        power = sorted_power[lo] + np.clip(frac, 0., 1.)\
+            * (sorted_power[hi] - sorted_power[lo])
+
+        power = np.where(ws < sorted_ws[first], 0., power)
+
+    else:
+
+        raise ValueError('unknown power curve method: '+str(method))
+
+    return np.where(np.isnan(ws), np.nan, power)
+
+
+def get_power_from_curve(ws, curve_ws, curve_power, method='step'):
+    """Convert wind speed into power using one power curve, for wind speed
+    arrays of any shape. See get_power_from_curves for the methods.
+    Linear interpolation on one power curve uses np.interp.
+    """
+
+    ws = np.asarray(ws, dtype=np.float64)
+
+    if method == 'linear':
+
+        curve_ws = np.asarray(curve_ws, dtype=np.float64)
+        curve_power = np.asarray(curve_power, dtype=np.float64)
+
+        order = np.argsort(curve_ws, kind='stable')
+
+        power = np.interp(ws, curve_ws[order], curve_power[order], left=0.,
+                          right=curve_power[order][-1])
 
-    for i, (x_i, y_i) in enumerate(zip(x, y)):
+        return np.where(np.isnan(ws), np.nan, power)
 
-        angle_series[i] = calculate_angle_diff(x_i, y_i)
+    power = get_power_from_curves(ws[..., np.newaxis],
+                                  [(curve_ws, curve_power)], method=method)
 
-    return angle_series
+    return power[..., 0]
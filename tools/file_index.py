@@ -0,0 +1,67 @@
+# This script indexes data files in a directory by the time stamps in
+# their file names, so that only files within the validation window
+# are opened.
+
+import os
+import numpy as np
+import pandas as pd
+
+
+def get_window(conf, freq):
+    """Return start and end times of data files to read.
+    This is the validation window, extended by one data time step and by
+    the longest ramp duration, if ramps are declared.
+    """
+
+    margin = pd.Timedelta(minutes=freq)
+
+    if 'ramps' in conf:
+        margin += max(pd.to_timedelta(str(ramps['duration']))
+                      for ramps in conf['ramps'])
+
+    start = pd.Timestamp(conf['time']['window']['start']) - margin
+    end = pd.Timestamp(conf['time']['window']['end']) + margin
+
+    return start, end
+
+
+def index_files(path, regex, time_format):
+    """Parse time stamps from all file names in path in one pass.
+    regex captures the parts of the time stamp in a file name,
+    which are joined and parsed using time_format.
+    Return file names and times, sorted by time.
+    File names that do not match are left out.
+    """
+
+    # Sort by name first, so that files with duplicated times are always
+    # in the same order
+    names = pd.Series(sorted(os.listdir(path)), dtype=object)
+
+    parts = names.str.extract(regex)
+
+    t_str = parts.iloc[:, 0]
+    for k in range(1, parts.shape[1]):
+        t_str = t_str + parts.iloc[:, k]
+
+    t = pd.to_datetime(t_str, format=time_format, errors='coerce')
+
+    keep = t.notna().values
+    names = names.values[keep]
+    times = t.values[keep]
+
+    order = np.argsort(times, kind='stable')
+
+    return names[order], times[order]
+
+
+def select_files(path, regex, time_format, window):
+    """Return paths of files in path with time stamps within
+    window, i.e. [start, end], using a binary search on sorted times.
+    """
+
+    names, times = index_files(path, regex, time_format)
+
+    lower = np.searchsorted(times, np.datetime64(window[0]), side='left')
+    upper = np.searchsorted(times, np.datetime64(window[1]), side='right')
+
+    return [os.path.join(path, name) for name in names[lower:upper]]
@@ -0,0 +1,159 @@
+# This script contains a manifest of data files already read for a
+# dataset, together with the values extracted from each file.
+# With the manifest, a rerun (e.g. an hourly operational run) only reads
+# data files that are new or changed since the last run, and merges them
+# into the stored time series.
+#
+# The manifest of a dataset is a directory in the cache directory, keyed
+# by the dataset information (e.g. path, variable and levels). It holds
+# the name, modification time and size of each file read, and .npy files
+# of the time and values extracted from each file, one row per file.
+
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+
+from tools import eval_tools
+
+
+def get_ingest_manifest(conf, info):
+    """Return an ingest_manifest when incremental: true is set for the
+    dataset, otherwise return None.
+    """
+
+    if info.get('incremental', False) is True:
+        return ingest_manifest(conf)
+
+    return None
+
+
+class ingest_manifest:
+    """Manifest of data files already read, and their extracted values."""
+
+    def __init__(self, conf):
+
+        self.path = os.path.join(eval_tools.get_cache_dir(conf), 'manifest')
+
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+
+    def load(self, info, columns):
+        """Load the manifest of a dataset, declared by a dictionary of
+        dataset information. Start an empty manifest if there is none.
+        """
+
+        key = hashlib.sha1(json.dumps(info, sort_keys=True,
+                                      default=str).encode()).hexdigest()
+        self.entry = os.path.join(self.path, key)
+
+        if os.path.exists(self.entry):
+
+            with open(os.path.join(self.entry, 'files.json')) as f:
+                self.files = json.load(f)
+
+            self.t = np.load(os.path.join(self.entry, 't.npy'))
+            self.values = np.load(os.path.join(self.entry, 'values.npy'))
+
+        else:
+
+            self.files = []
+            self.t = np.empty(0, dtype=np.int64)
+            self.values = np.empty((0, len(columns)))
+
+        # Row of each file name
+        self.rows = {f[0]: k for k, f in enumerate(self.files)}
+
+        # File status of this run, filled by get_new_files
+        self.stats = {}
+
+    def get_new_files(self, file_list):
+        """Return files in file_list that are not in the manifest,
+        or have been modified since they were read.
+        """
+
+        new_list = []
+
+        for file in file_list:
+
+            name = os.path.basename(file)
+            stat = os.stat(file)
+            self.stats[name] = [stat.st_mtime_ns, stat.st_size]
+
+            k = self.rows.get(name)
+
+            if k is None or self.files[k][1:] != self.stats[name]:
+                new_list.append(file)
+
+        return new_list
+
+    def update(self, file_list, t, values):
+        """Add or replace the rows of files read in this run,
+        then save the manifest.
+        """
+
+        t = np.asarray(t, dtype='datetime64[ns]').astype(np.int64)
+
+        new_t = []
+        new_values = []
+
+        for file, t_i, values_i in zip(file_list, t, values):
+
+            name = os.path.basename(file)
+            k = self.rows.get(name)
+
+            # Changed file, replace its row
+            if k is not None:
+
+                self.files[k] = [name] + self.stats[name]
+                self.t[k] = t_i
+                self.values[k] = values_i
+
+            else:
+
+                self.rows[name] = len(self.files)
+                self.files.append([name] + self.stats[name])
+                new_t.append(t_i)
+                new_values.append(values_i)
+
+        if new_t:
+            self.t = np.concatenate([self.t, new_t])
+            self.values = np.concatenate([self.values, new_values])
+
+        self.save()
+
+    def save(self):
+        """Write the manifest, replacing the previous one."""
+
+        tmp_entry = self.entry+'.'+str(os.getpid())+'.tmp'
+
+        os.makedirs(tmp_entry)
+
+        with open(os.path.join(tmp_entry, 'files.json'), 'w') as f:
+            json.dump(self.files, f)
+
+        np.save(os.path.join(tmp_entry, 't.npy'), self.t)
+        np.save(os.path.join(tmp_entry, 'values.npy'), self.values)
+
+        if os.path.exists(self.entry):
+            shutil.rmtree(self.entry)
+
+        os.replace(tmp_entry, self.entry)
+
+    def get_df(self, file_list, columns, index_name='t'):
+        """Return the time series of the files in file_list,
+        sorted by time.
+        """
+
+        rows = [self.rows[os.path.basename(file)] for file in file_list]
+
+        df = pd.DataFrame(
+            self.values[rows],
+            index=pd.DatetimeIndex(self.t[rows].astype('datetime64[ns]'),
+                                   name=index_name),
+            columns=columns
+            )
+
+        return df.sort_index(kind='stable')
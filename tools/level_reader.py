@@ -0,0 +1,100 @@
+# This script contains the reading flow shared by input parsers that read
+# one time step at all heights from each data file, e.g. sodar_netcdf and
+# wrf_netcdf:
+#   select files within the validation window,
+#   load the time series from series_cache if it is there,
+#   otherwise only read new or changed files if ingest_manifest is used,
+#   read files (in a process pool if workers > 1),
+#   convert masked and flagged values to NaN,
+#   and save the time by height data frame to series_cache.
+#
+# Each parser only provides its function to read one file and the
+# information that identifies the dataset.
+
+from qc import check_input_data
+from tools import eval_tools, file_index
+from tools.ts_builder import ts_builder
+
+
+def read_levels(parser, read_fn, ds_info, levels, file_regex, time_format):
+    """Return the time by height data frame of parser, at all heights in
+    levels, and set parser.file_num to the number of files in the window.
+
+    Keyword arguments:
+    parser -- input parser with path, window, workers, flag, target_var,
+    cache (series_cache or None) and manifest (ingest_manifest or None).
+    read_fn -- function of a file path that returns its time, its values
+    at all heights in levels, and any other items, which are passed to
+    parser.add_read_info if the parser has it.
+    ds_info -- dictionary of dataset information, as key of cached data.
+    file_regex, time_format -- time stamps in file names, for file_index.
+    """
+
+    file_list = file_index.select_files(
+        parser.path, file_regex, time_format, parser.window)
+    parser.file_num = len(file_list)
+
+    if parser.cache is not None:
+
+        cache_key = parser.cache.get_key(ds_info, file_list)
+
+        df = parser.cache.load(cache_key)
+
+        if df is not None:
+
+            print()
+            print('load '+parser.target_var+' from cache, instead of '
+                  + 'reading '+str(parser.file_num)+' data files')
+
+            return df
+
+    read_list = file_list
+
+    if parser.manifest is not None:
+
+        parser.manifest.load(ds_info, levels)
+        read_list = parser.manifest.get_new_files(file_list)
+
+        print()
+        print('read '+str(len(read_list))+' new or changed data files, '
+              + str(parser.file_num-len(read_list))+' data files were '
+              + 'read in previous runs')
+
+    # Files are sorted by time, so masked and flagged values are
+    # reported in time order
+    results = eval_tools.map_files(read_fn, read_list, parser.workers)
+
+    ts = ts_builder(levels, size=len(results))
+
+    # To print an empty line before masked value error messages
+    mask_i = 0
+
+    for t, ws_all, *_ in results:
+
+        ws_row = []
+
+        for ws in ws_all:
+
+            ws, mask_i = check_input_data.convert_mask_to_nan(
+                ws, t, mask_i)
+            ws = check_input_data.convert_flag_to_nan(ws, parser.flag, t)
+
+            ws_row.append(float(ws))
+
+        ts.add(t, ws_row)
+
+    # Parser specific information of each file read, e.g. grid indices
+    if hasattr(parser, 'add_read_info'):
+        parser.add_read_info([result[2:] for result in results])
+
+    if parser.manifest is not None:
+        # Merge with files read in previous runs
+        parser.manifest.update(read_list, ts.t[:ts.n], ts.values[:ts.n])
+        df = parser.manifest.get_df(file_list, levels)
+    else:
+        df = ts.get_df()
+
+    if parser.cache is not None:
+        parser.cache.save(cache_key, df)
+
+    return df
@@ -0,0 +1,194 @@
+# This script accumulates moment-based metrics over chunks of baseline (x)
+# and compare (y) data, so that long records do not need to be held in
+# memory at once, and chunks can be spread across processes.
+#
+# For each chunk, the means and co-moments (sums of products of
+# deviations from the means) of x, y, y - x and |y - x| are computed with
+# numpy's pairwise sums, and merged into the running values with the
+# parallel (Chan et al.) form of Welford's algorithm. Accumulators of
+# different chunks or processes are merged the same way.
+#
+# Optionally, the median-based metrics mdae, mdae_pct and msa are
+# estimated with quantile sketches, which are exact while the data are
+# small enough to be kept in memory.
+
+import numpy as np
+
+from tools import metric_kernel
+from tools.quantile_sketch import quantile_sketch
+
+accumulator_metrics = ['bias', 'bias_pct', 'crmse', 'mae', 'mae_pct',
+                       'nrmse', 'rmse']
+median_metrics = ['mdae', 'mdae_pct', 'msa']
+
+
+def merge_moments(n_a, mean_a, c_a, n_b, mean_b, c_b):
+    """Merge the counts, means and co-moments of two sets of values."""
+
+    n = n_a + n_b
+
+    if n_a == 0:
+        return n_b, mean_b, c_b
+    if n_b == 0:
+        return n_a, mean_a, c_a
+
+    delta = mean_b - mean_a
+
+    mean = mean_a + delta * n_b / n
+    c = c_a + c_b + np.multiply.outer(delta, delta) * n_a * n_b / n
+
+    return n, mean, c
+
+
+def get_moments(v):
+    """Return the count, means and co-moments of the columns of v."""
+
+    n = len(v)
+
+    if n == 0:
+        return 0, np.zeros(v.shape[1]), np.zeros((v.shape[1], v.shape[1]))
+
+    mean = v.mean(axis=0)
+    dev = v - mean
+
+    return n, mean, dev.T @ dev
+
+
+class metric_accumulator:
+    """Mergeable accumulator of bias, bias_pct, crmse, mae, mae_pct, nrmse
+    and rmse, and of mdae, mdae_pct and msa if median is True.
+    Keyword arguments of quantile_sketch, e.g. alpha and exact_limit,
+    are passed to the sketches of the median-based metrics.
+    """
+
+    def __init__(self, median=False, **sketch_args):
+
+        # Columns x, y, y - x and |y - x|
+        self.n = 0
+        self.mean = np.zeros(4)
+        self.c = np.zeros((4, 4))
+
+        # Columns (y - x) / x and |y - x| / x, for valid values only
+        self.n_ratio = 0
+        self.mean_ratio = np.zeros(2)
+        self.c_ratio = np.zeros((2, 2))
+        self.invalid_num = 0
+
+        if median:
+            self.sketches = {name: quantile_sketch(**sketch_args)
+                             for name in median_metrics}
+        else:
+            self.sketches = {}
+
+    def update(self, x, y):
+        """Add a chunk of x and y data."""
+
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+
+        diff = y - x
+        abs_diff = np.abs(diff)
+
+        self.n, self.mean, self.c = merge_moments(
+            self.n, self.mean, self.c,
+            *get_moments(np.column_stack([x, y, diff, abs_diff]))
+            )
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.column_stack([diff / x, abs_diff / x])
+
+        valid = np.isfinite(ratio[:, 0])
+        self.invalid_num += int(len(valid) - valid.sum())
+
+        self.n_ratio, self.mean_ratio, self.c_ratio = merge_moments(
+            self.n_ratio, self.mean_ratio, self.c_ratio,
+            *get_moments(ratio[valid])
+            )
+
+        if self.sketches:
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                log_q = np.abs(np.log(y / x))
+
+            self.sketches['mdae'].update(abs_diff)
+            self.sketches['mdae_pct'].update(100 * ratio[valid, 1])
+            self.sketches['msa'].update(log_q)
+
+        return self
+
+    def merge(self, other):
+        """Merge another accumulator, e.g. of another chunk or process."""
+
+        self.n, self.mean, self.c = merge_moments(
+            self.n, self.mean, self.c, other.n, other.mean, other.c
+            )
+        self.n_ratio, self.mean_ratio, self.c_ratio = merge_moments(
+            self.n_ratio, self.mean_ratio, self.c_ratio,
+            other.n_ratio, other.mean_ratio, other.c_ratio
+            )
+        self.invalid_num += other.invalid_num
+
+        for name, sketch in self.sketches.items():
+            sketch.merge(other.sketches[name])
+
+        return self
+
+    def compute(self, names):
+        """Return a dictionary of the metrics in names which are in
+        accumulator_metrics, or in median_metrics if the accumulator has
+        sketches, from all data added so far.
+        """
+
+        mean_x, mean_y, mean_diff, mean_abs_diff = self.mean
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+
+            # Population variances and covariance
+            var = self.c / self.n
+
+            # mean((x/mean(x) - y/mean(y))^2), from variances and covariance
+            nrmse_sq = var[0, 0] / mean_x**2 + var[1, 1] / mean_y**2\
+                - 2 * var[0, 1] / (mean_x * mean_y)
+
+            results = {
+                'bias': mean_diff,
+                'bias_pct': 100 * self.mean_ratio[0],
+                'crmse': np.sqrt(var[2, 2]),
+                'mae': mean_abs_diff,
+                'mae_pct': 100 * self.mean_ratio[1],
+                'nrmse': np.sqrt(max(nrmse_sq, 0)),
+                'rmse': np.sqrt(var[2, 2] + mean_diff**2)
+                }
+
+        out = {}
+
+        for name in names:
+
+            if name in self.sketches:
+
+                if name == 'mdae_pct':
+                    metric_kernel.print_invalid_num(self.invalid_num, 'mae')
+
+                median = self.sketches[name].get_median()
+
+                if name == 'msa':
+                    out[name] = float((np.exp(median) - 1)*100)
+                else:
+                    out[name] = median
+
+                continue
+
+            if name not in accumulator_metrics:
+                continue
+
+            if name == 'bias_pct':
+                metric_kernel.print_invalid_num(self.invalid_num, 'bias')
+            if name == 'mae_pct':
+                metric_kernel.print_invalid_num(self.invalid_num, 'mae')
+
+            if (self.n == 0) or (name.endswith('_pct') and self.n_ratio == 0):
+                out[name] = np.nan
+            else:
+                out[name] = float(results[name])
+
+        return out
@@ -0,0 +1,266 @@
+# This script computes the metrics in the metrics directory together,
+# for a baseline (x) and a compare (y) dataset.
+#
+# Intermediates shared by several metrics, e.g. the difference y - x,
+# its absolute values, the means of x and y and the percentage ratios,
+# are only computed once on float64 arrays, and one sort serves all
+# medians. Metrics are computed along the last axis, so that 2-D arrays
+# (e.g. of resampled time series) are evaluated in one call.
+#
+# Metrics which are not listed in fused_metrics are computed by their
+# classes in the metrics directory, as plugins.
+
+import numpy as np
+
+fused_metrics = ['bias', 'bias_pct', 'crmse', 'mae', 'mae_pct', 'mdae',
+                 'mdae_pct', 'msa', 'nrmse', 'rmse']
+
+
+def get_median(a, valid=None):
+    """Median along the last axis, only using valid values if a boolean
+    array valid is given.
+    Invalid values are sorted to the end, after one sort.
+    """
+
+    if valid is not None:
+        a = np.where(valid, a, np.nan)
+
+    a = np.sort(a, axis=-1)
+
+    if valid is None:
+        n = np.full(a.shape[:-1], a.shape[-1])
+    else:
+        n = valid.sum(axis=-1)
+
+    lo_ind = np.maximum((n-1)//2, 0)[..., np.newaxis]
+    hi_ind = np.minimum(n//2, a.shape[-1]-1)[..., np.newaxis]
+
+    lo = np.take_along_axis(a, lo_ind, axis=-1)[..., 0]
+    hi = np.take_along_axis(a, hi_ind, axis=-1)[..., 0]
+
+    return np.where(n > 0, (lo + hi) / 2, np.nan)
+
+
+def get_masked_mean(a, valid):
+    """Mean along the last axis, only using valid values."""
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(valid, a, 0).sum(axis=-1) / valid.sum(axis=-1)
+
+
+def print_invalid(valid, name):
+    """Print the number of invalid values ignored in a percentage metric."""
+
+    print_invalid_num(int(np.size(valid) - np.sum(valid)), name)
+
+
+def print_invalid_num(invalid_num, name):
+    """Print a number of invalid values ignored in a percentage metric."""
+
+    if invalid_num > 0:
+
+        print()
+        print('- in calculating '+name+' percentage, '
+              + str(invalid_num)+' invalid data points, which would have')
+        print('led to undefined results '
+              + '(e.g., division by zero), are ignored.')
+
+
+def to_result(a):
+    """Return a float for a single metric value."""
+
+    if np.ndim(a) == 0:
+        return float(a)
+
+    return a
+
+
+def compute(x, y, names, verbose=True):
+    """Compute the metrics in names which are in fused_metrics.
+    x is baseline and y is compare data, with time along the last axis.
+    Return a dictionary of metric names and results.
+    Numbers of invalid values in percentage metrics are printed
+    if verbose is True.
+    """
+
+    names = [n for n in names if n in fused_metrics]
+
+    if not names:
+        return {}
+
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+
+    out = {}
+
+    diff = y - x
+    abs_diff = np.abs(diff)
+
+    mean_x = np.mean(x, axis=-1, keepdims=True)
+    mean_y = np.mean(y, axis=-1, keepdims=True)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+
+        if 'bias_pct' in names:
+            ratio = diff / x
+            ratio_valid = np.isfinite(ratio)
+
+        if {'mae_pct', 'mdae_pct'} & set(names):
+            abs_ratio = abs_diff / x
+            abs_ratio_valid = np.isfinite(abs_ratio)
+
+        if 'msa' in names:
+            log_q = np.abs(np.log(y / x))
+
+    for name in names:
+
+        if name == 'bias':
+            out[name] = np.mean(diff, axis=-1)
+
+        elif name == 'bias_pct':
+            if verbose:
+                print_invalid(ratio_valid, 'bias')
+            out[name] = get_masked_mean(100 * ratio, ratio_valid)
+
+        elif name == 'crmse':
+            out[name] = np.sqrt(np.mean(((x - mean_x) - (y - mean_y))**2,
+                                        axis=-1))
+
+        elif name == 'mae':
+            out[name] = np.mean(abs_diff, axis=-1)
+
+        elif name == 'mae_pct':
+            if verbose:
+                print_invalid(abs_ratio_valid, 'mae')
+            out[name] = get_masked_mean(100 * abs_ratio, abs_ratio_valid)
+
+        elif name == 'mdae':
+            out[name] = get_median(abs_diff)
+
+        elif name == 'mdae_pct':
+            if verbose:
+                print_invalid(abs_ratio_valid, 'mae')
+            out[name] = get_median(100 * abs_ratio, abs_ratio_valid)
+
+        elif name == 'msa':
+            out[name] = (np.exp(get_median(log_q, ~np.isnan(log_q))) - 1)*100
+
+        elif name == 'nrmse':
+            out[name] = np.sqrt(np.mean((x/mean_x - y/mean_y)**2, axis=-1))
+
+        elif name == 'rmse':
+            out[name] = np.sqrt(np.mean(diff**2, axis=-1))
+
+    return {name: to_result(val) for name, val in out.items()}
+
+
+def get_group_median(v, g, group_num):
+    """Median of v in each of group_num groups, g being the group number
+    of each value. NaN values are ignored.
+    One sort by group and value serves all groups.
+    """
+
+    keep = ~np.isnan(v)
+    v = v[keep]
+    g = g[keep]
+
+    if len(v) == 0:
+        return np.full(group_num, np.nan)
+
+    order = np.lexsort((v, g))
+    v = v[order]
+
+    n = np.bincount(g, minlength=group_num)
+    start = np.cumsum(n) - n
+
+    lo = v[np.minimum(start + np.maximum((n-1)//2, 0), len(v)-1)]
+    hi = v[np.minimum(start + n//2, len(v)-1)]
+
+    return np.where(n > 0, (lo + hi) / 2, np.nan)
+
+
+def compute_grouped(x, y, g, group_num, names, verbose=True):
+    """Compute the metrics in names which are in fused_metrics, for each
+    of group_num groups, g being the group number of each value of x and y.
+    Sums are accumulated for all groups at once with np.bincount.
+    Return a dictionary of metric names and arrays of results by group,
+    with NaN for empty groups.
+    """
+
+    names = [n for n in names if n in fused_metrics]
+
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    g = np.asarray(g, dtype=np.int64)
+
+    def group_mean(v, valid=None):
+
+        if valid is not None:
+            v = np.where(valid, v, 0)
+            n = np.bincount(g, weights=valid, minlength=group_num)
+        else:
+            n = np.bincount(g, minlength=group_num)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.bincount(g, weights=v, minlength=group_num) / n
+
+    out = {}
+
+    diff = y - x
+    abs_diff = np.abs(diff)
+
+    mean_x = group_mean(x)
+    mean_y = group_mean(y)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+
+        ratio = diff / x
+        abs_ratio = abs_diff / x
+        ratio_valid = np.isfinite(ratio)
+
+        log_q = np.abs(np.log(y / x))
+
+        for name in names:
+
+            if name == 'bias':
+                out[name] = group_mean(diff)
+
+            elif name == 'bias_pct':
+                if verbose:
+                    print_invalid(ratio_valid, 'bias')
+                out[name] = group_mean(100 * ratio, ratio_valid)
+
+            elif name == 'crmse':
+                out[name] = np.sqrt(group_mean(
+                    ((x - mean_x[g]) - (y - mean_y[g]))**2))
+
+            elif name == 'mae':
+                out[name] = group_mean(abs_diff)
+
+            elif name == 'mae_pct':
+                if verbose:
+                    print_invalid(ratio_valid, 'mae')
+                out[name] = group_mean(100 * abs_ratio, ratio_valid)
+
+            elif name == 'mdae':
+                out[name] = get_group_median(abs_diff, g, group_num)
+
+            elif name == 'mdae_pct':
+                if verbose:
+                    print_invalid(ratio_valid, 'mae')
+                out[name] = get_group_median(
+                    np.where(ratio_valid, 100 * abs_ratio, np.nan), g,
+                    group_num)
+
+            elif name == 'msa':
+                out[name] = (np.exp(get_group_median(log_q, g, group_num))
+                             - 1)*100
+
+            elif name == 'nrmse':
+                out[name] = np.sqrt(group_mean(
+                    (x/mean_x[g] - y/mean_y[g])**2))
+
+            elif name == 'rmse':
+                out[name] = np.sqrt(group_mean(diff**2))
+
+    return out
@@ -0,0 +1,145 @@
+# This script estimates quantiles (e.g. medians) of non-negative values
+# which arrive in chunks, for median-based metrics in streaming or
+# parallel pipelines.
+#
+# Values are kept exactly until there are more than exact_limit of them,
+# then they are counted in a fixed-bin histogram with logarithmic bins.
+# A bin holds values between min_value * gamma^(i-1) and
+# min_value * gamma^i, with gamma = (1 + alpha) / (1 - alpha), and is
+# estimated by 2 * min_value * gamma^i / (gamma + 1), so the relative error
+# of an estimated quantile is at most alpha for values between min_value
+# and max_value. Values up to min_value are counted as 0, and values above
+# max_value are estimated by the largest value added.
+#
+# Sketches with the same parameters are merged by adding their counts.
+
+import math
+import numpy as np
+
+
+class quantile_sketch:
+    """Mergeable quantile sketch of non-negative values."""
+
+    def __init__(self, alpha=0.005, min_value=1e-9, max_value=1e9,
+                 exact_limit=1000000):
+
+        self.alpha = alpha
+        self.min_value = min_value
+        self.max_value = max_value
+        self.exact_limit = exact_limit
+
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.bin_num = math.ceil(math.log(max_value / min_value,
+                                          self.gamma))
+
+        # Exact values, or None after switching to the histogram
+        self.values = []
+        self.n = 0
+        self.counts = None
+        self.max = -np.inf
+
+    def get_bins(self, v):
+        """Return the bins of values: 0 for values up to min_value,
+        bin_num + 1 for values above max_value.
+        """
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ind = np.ceil(np.log(v / self.min_value) / np.log(self.gamma))
+
+        ind = np.where(v < self.min_value, 0, ind)
+        ind = np.where(v > self.max_value, self.bin_num + 1, ind)
+
+        return np.clip(ind, 0, self.bin_num + 1).astype(np.int64)
+
+    def to_histogram(self):
+        """Move exact values into the histogram."""
+
+        self.counts = np.zeros(self.bin_num + 2, dtype=np.int64)
+
+        for v in self.values:
+            self.counts += np.bincount(self.get_bins(v),
+                                       minlength=self.bin_num + 2)
+
+        self.values = None
+
+    def update(self, v):
+        """Add a chunk of values. NaN values are ignored."""
+
+        v = np.asarray(v, dtype=np.float64).ravel()
+        v = v[~np.isnan(v)]
+
+        if len(v) == 0:
+            return self
+
+        self.n += len(v)
+        self.max = max(self.max, v.max())
+
+        if self.values is not None:
+
+            self.values.append(v)
+
+            if self.n > self.exact_limit:
+                self.to_histogram()
+
+        else:
+
+            self.counts += np.bincount(self.get_bins(v),
+                                       minlength=self.bin_num + 2)
+
+        return self
+
+    def merge(self, other):
+        """Merge another sketch with the same parameters."""
+
+        self.n += other.n
+        self.max = max(self.max, other.max)
+
+        if self.values is not None and other.values is not None:
+
+            self.values = self.values + other.values
+
+            if self.n > self.exact_limit:
+                self.to_histogram()
+
+        else:
+
+            if self.values is not None:
+                self.to_histogram()
+
+            if other.values is not None:
+                for v in other.values:
+                    self.counts += np.bincount(self.get_bins(v),
+                                               minlength=self.bin_num + 2)
+            else:
+                self.counts += other.counts
+
+        return self
+
+    def is_exact(self):
+        """Return True if quantiles are still computed from exact values."""
+
+        return self.values is not None
+
+    def get_rank(self, rank):
+        """Estimate the value at a rank (0 for the smallest value)."""
+
+        ind = np.searchsorted(np.cumsum(self.counts), rank, side='right')
+
+        if ind == 0:
+            return 0.
+        if ind == self.bin_num + 1:
+            return float(self.max)
+
+        return 2 * self.min_value * self.gamma**ind / (self.gamma + 1)
+
+    def get_median(self):
+        """Return the median, exact while all values are kept."""
+
+        if self.n == 0:
+            return np.nan
+
+        if self.is_exact():
+            return float(np.median(np.concatenate(self.values)))
+
+        return (self.get_rank((self.n - 1) // 2)
+                + self.get_rank(self.n // 2)) / 2
@@ -0,0 +1,143 @@
+# This script contains an on-disk cache for time series extracted from
+# data files, so that a rerun on the same inputs does not read the data
+# files again.
+#
+# Each cache entry is a directory of .npy files, which are loaded as
+# memory maps. Entries are keyed by the dataset information and by the
+# names, modification times and sizes of the data files. The least
+# recently used entries are removed when the cache exceeds its size limit.
+
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+
+from tools import eval_tools
+
+
+def get_series_cache(conf):
+    """Return a series_cache when it is enabled in the configuration
+    (cache: series: true), otherwise return None.
+    """
+
+    if 'cache' in conf and conf['cache'].get('series', False) is True:
+        return series_cache(conf)
+
+    return None
+
+
+class series_cache:
+    """On-disk cache of extracted time series."""
+
+    def __init__(self, conf):
+
+        self.path = os.path.join(eval_tools.get_cache_dir(conf), 'series')
+
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+
+        # Size limit of all entries, in MB
+        try:
+            self.size_mb = conf['cache']['size_mb']
+        except KeyError:
+            self.size_mb = 1024
+
+    def get_key(self, info, file_list):
+        """Return a key from a dictionary of dataset information
+        (e.g. path, variable, levels, location and select method) and the
+        name, modification time and size of each data file.
+        """
+
+        h = hashlib.sha1(json.dumps(info, sort_keys=True,
+                                    default=str).encode())
+
+        for file in file_list:
+
+            stat = os.stat(file)
+            h.update((os.path.basename(file)+' '+str(stat.st_mtime_ns)
+                      + ' '+str(stat.st_size)+'\n').encode())
+
+        return h.hexdigest()
+
+    def load(self, key):
+        """Return the cached data frame, or None when there is no entry."""
+
+        entry = os.path.join(self.path, key)
+
+        if not os.path.exists(entry):
+            return None
+
+        with open(os.path.join(entry, 'meta.json')) as f:
+            meta = json.load(f)
+
+        t = np.load(os.path.join(entry, 't.npy'), mmap_mode='r')
+        values = np.load(os.path.join(entry, 'values.npy'), mmap_mode='r')
+
+        # Mark as recently used
+        os.utime(os.path.join(entry, 'meta.json'))
+
+        return pd.DataFrame(
+            values,
+            index=pd.DatetimeIndex(t.astype('datetime64[ns]'),
+                                   name=meta['index_name']),
+            columns=meta['columns']
+            )
+
+    def save(self, key, df):
+        """Save a data frame as a cache entry, then remove the least
+        recently used entries if the cache exceeds its size limit.
+        """
+
+        entry = os.path.join(self.path, key)
+        tmp_entry = entry+'.'+str(os.getpid())+'.tmp'
+
+        os.makedirs(tmp_entry)
+
+        np.save(os.path.join(tmp_entry, 't.npy'),
+                df.index.values.astype('datetime64[ns]').astype(np.int64))
+        np.save(os.path.join(tmp_entry, 'values.npy'),
+                np.ascontiguousarray(df.values, dtype=np.float64))
+
+        with open(os.path.join(tmp_entry, 'meta.json'), 'w') as f:
+            json.dump({'index_name': df.index.name,
+                       'columns': list(df.columns)}, f, default=str)
+
+        # Another process may have written the same entry in the meantime
+        if os.path.exists(entry):
+            shutil.rmtree(tmp_entry)
+        else:
+            os.replace(tmp_entry, entry)
+
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache is within
+        its size limit.
+        """
+
+        entries = []
+
+        for key in os.listdir(self.path):
+
+            entry = os.path.join(self.path, key)
+
+            if key.endswith('.tmp') or not os.path.isdir(entry):
+                continue
+
+            size = sum(os.path.getsize(os.path.join(entry, f))
+                       for f in os.listdir(entry))
+            used = os.path.getmtime(os.path.join(entry, 'meta.json'))
+
+            entries.append((used, size, entry))
+
+        total = sum(e[1] for e in entries)
+
+        for used, size, entry in sorted(entries):
+
+            if total <= self.size_mb * 1e6:
+                break
+
+            shutil.rmtree(entry)
+            total -= size
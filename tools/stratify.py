@@ -0,0 +1,77 @@
+# This script computes metrics by time of day, month and season,
+# as listed in the stratify section of the configuration, e.g.
+#   stratify:
+#     - hour
+#     - month
+#     - season
+#
+# Each time step is given a group number, and all groups are computed
+# in one pass with metric_kernel.compute_grouped.
+
+import numpy as np
+import pandas as pd
+
+from tools import metric_kernel
+
+season_names = ['DJF', 'MAM', 'JJA', 'SON']
+
+
+def get_groups(index, stratum):
+    """Return the group number of each time step, and the group names,
+    for a stratum: hour (of day), month or season.
+    """
+
+    if stratum == 'hour':
+        return np.asarray(index.hour), list(range(24))
+
+    if stratum == 'month':
+        return np.asarray(index.month) - 1, list(range(1, 13))
+
+    if stratum == 'season':
+        return np.asarray(index.month) % 12 // 3, season_names
+
+    raise ValueError('unknown stratum: '+str(stratum)
+                     + ', use hour, month or season')
+
+
+def get_metrics(index, x, y, metrics, strata):
+    """Compute metrics for each group of each stratum in strata.
+    index is the time index of baseline x and compare y,
+    and metrics is a list of metric class instances, of which those not
+    in metric_kernel are computed by their classes for each group.
+    Return a tidy data frame, with one row per stratum, group and metric.
+    """
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    names = [m.__class__.__name__ for m in metrics]
+
+    out_list = []
+
+    for stratum in strata:
+
+        g, groups = get_groups(index, stratum)
+
+        n = np.bincount(g, minlength=len(groups))
+
+        grouped = metric_kernel.compute_grouped(
+            x, y, g, len(groups), names, verbose=False
+            )
+
+        for m, name in zip(metrics, names):
+
+            if name not in grouped:
+                grouped[name] = [m.compute(x[g == i], y[g == i])
+                                 if n[i] > 0 else np.nan
+                                 for i in range(len(groups))]
+
+            out_list.append(pd.DataFrame({
+                'stratum': stratum,
+                'group': groups,
+                'n': n,
+                'metric': name,
+                'value': grouped[name]
+                }))
+
+    return pd.concat(out_list, ignore_index=True)
@@ -0,0 +1,64 @@
+# This script runs unit tests for binning.
+
+import numpy as np
+import pytest
+
+from tools import binning, eval_tools
+
+
+def read_metrics(names):
+
+    return [eval_tools.get_module_class('metrics', n)() for n in names]
+
+
+def test_get_sector_bins():
+
+    g, low, high = binning.get_sector_bins([0, 44, 46, 350, 359, np.nan], 8)
+
+    assert list(g) == [0, 1, 1, 0, 0, 8]
+    assert low[0] == 337.5 and high[0] == 22.5
+
+
+def test_get_metrics_ws():
+
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 30, 2000)
+    y = x + rng.normal(0.5, 1, 2000)
+    metrics = read_metrics(['bias', 'rmse'])
+
+    df = binning.get_metrics(x, x, y, metrics,
+                             {'binning': {'ws_bins': [0, 25, 5]}}, 'ws')
+
+    # 5 bins, values above 25 are not in any bin
+    assert len(df) == 5 * 2
+    assert df['n'].iloc[:5].sum() == (x < 25).sum()
+
+    row = df[(df['low'] == 10) & (df['metric'] == 'rmse')]
+    mask = (x >= 10) & (x < 15)
+
+    assert np.isclose(row['value'].iloc[0],
+                      metrics[1].compute(x[mask], y[mask]))
+
+
+def test_get_metrics_other():
+
+    assert binning.get_metrics([1], [1], [1], [], {'binning': {}},
+                               'power') is None
+
+
+def test_read_power_curve_fleet(tmp_path):
+
+    (tmp_path / 'pc_a.csv').write_text('ws,power\n3,0\n4,100\n25,2400\n')
+    (tmp_path / 'fleet.csv').write_text(
+        'type,file,count,hub_height\na,pc_a.csv,2,80\n')
+
+    p_curve = {'path': str(tmp_path), 'ws': 'ws', 'power': 'power'}
+
+    # Power curve of the first turbine type when only a fleet is declared
+    conf = {'power_curve': dict(p_curve, fleet='fleet.csv'),
+            'binning': {'ws_bins': 'power_curve'}}
+
+    np.testing.assert_array_equal(binning.get_ws_edges(conf), [3, 4, 25])
+
+    with pytest.raises(ValueError):
+        binning.read_power_curve({'power_curve': p_curve})
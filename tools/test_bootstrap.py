@@ -0,0 +1,65 @@
+# This script runs unit tests for bootstrap.
+
+import numpy as np
+
+from tools import bootstrap, eval_tools
+
+boot_conf = {'n_boot': 200, 'block': 10, 'seed': 1}
+
+
+def get_data():
+
+    rng = np.random.default_rng(0)
+    x = rng.uniform(1, 15, 1000)
+    y = x + rng.normal(0.5, 2, 1000)
+
+    return x, y
+
+
+def read_metrics(names):
+
+    return [eval_tools.get_module_class('metrics', n)() for n in names]
+
+
+def test_get_block_index():
+
+    rng = np.random.default_rng(0)
+    index = bootstrap.get_block_index(25, 10, 3, rng)
+
+    assert index.shape == (3, 25)
+    # Consecutive time steps within blocks
+    assert (np.diff(index[:, :10], axis=1) == 1).all()
+    assert index.min() >= 0 and index.max() < 25
+
+
+def test_get_ci():
+
+    x, y = get_data()
+    metrics = read_metrics(['bias', 'rmse', 'mdae'])
+
+    ci = bootstrap.get_ci(x, y, metrics, boot_conf)
+
+    for m in metrics:
+
+        low, high = ci[m.__class__.__name__]
+        assert low < m.compute(x, y) < high
+
+    # Deterministic, and independent of chunk size
+    assert bootstrap.get_ci(x, y, metrics, boot_conf) == ci
+    assert bootstrap.get_ci(x, y, metrics,
+                            dict(boot_conf, max_mb=0.5)) == ci
+
+
+def test_get_ci_plugin():
+
+    class dracarys:
+
+        def compute(self, x, y):
+
+            return float(np.max(y - x))
+
+    x, y = get_data()
+
+    ci = bootstrap.get_ci(x, y, [dracarys()], boot_conf)
+
+    assert ci['dracarys'][0] <= ci['dracarys'][1] <= np.max(y - x)
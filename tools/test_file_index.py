@@ -0,0 +1,62 @@
+# This script runs unit tests for file_index.
+
+import os
+import datetime
+import pandas as pd
+
+from tools import file_index
+
+regex_eg = r'^(?:[^.]*\.){3}(\d{8})\.(\d{6})'
+format_eg = '%Y%m%d%H%M%S'
+
+files_eg = ['sodar.z06.b0.20160923.002000.txt.a2e.nc',
+            'sodar.z06.b0.20160923.000000.txt.a2e.nc',
+            'sodar.z06.b0.20160923.001000.txt.a2e.nc',
+            'sodar.z06.b0.20160923.001000.txt2.a2e.nc',
+            'sodar.z06.b0.20160923.003000.txt.a2e.nc',
+            'README.md']
+
+conf_eg = {'time': {'window': {
+    'start': datetime.datetime(2016, 9, 23, 0, 20),
+    'end': datetime.datetime(2016, 9, 23, 0, 20)}},
+    'ramps': [{'duration': '10 minutes'}, {'duration': '20 minutes'}]
+    }
+
+
+def make_files(tmp_path):
+
+    for file in files_eg:
+        (tmp_path / file).touch()
+
+    return str(tmp_path)
+
+
+def test_index_files(tmp_path):
+
+    names, times = file_index.index_files(
+        make_files(tmp_path), regex_eg, format_eg)
+
+    assert list(names) == [files_eg[1], files_eg[2], files_eg[3],
+                           files_eg[0], files_eg[4]]
+    assert pd.Timestamp(times[0]) == pd.Timestamp('2016-09-23 00:00')
+
+
+def test_get_window():
+
+    start, end = file_index.get_window(conf_eg, 10)
+
+    assert start == pd.Timestamp('2016-09-22 23:50')
+    assert end == pd.Timestamp('2016-09-23 00:50')
+
+
+def test_select_files(tmp_path):
+
+    path = make_files(tmp_path)
+
+    window = (pd.Timestamp('2016-09-23 00:10'),
+              pd.Timestamp('2016-09-23 00:20'))
+
+    files = file_index.select_files(path, regex_eg, format_eg, window)
+
+    assert files == [os.path.join(path, f) for f in files_eg[2:4]]\
+        + [os.path.join(path, files_eg[0])]
@@ -0,0 +1,65 @@
+# This script runs unit tests for ingest_manifest.
+
+import numpy as np
+import pandas as pd
+
+from tools.ingest_manifest import ingest_manifest, get_ingest_manifest
+
+info_eg = {'path': 'data', 'var': 'ws', 'levels': [40, 80]}
+
+
+def get_manifest(tmp_path):
+
+    manifest = ingest_manifest({'cache': {'path': str(tmp_path / 'cache')}})
+    manifest.load(info_eg, [40, 80])
+
+    return manifest
+
+
+def make_file(tmp_path, name, content='a'):
+
+    file = tmp_path / name
+    file.write_text(content)
+
+    return str(file)
+
+
+def test_get_ingest_manifest(tmp_path):
+
+    conf = {'cache': {'path': str(tmp_path / 'cache')}}
+
+    assert get_ingest_manifest(conf, {}) is None
+    assert isinstance(get_ingest_manifest(conf, {'incremental': True}),
+                      ingest_manifest)
+
+
+def test_incremental(tmp_path):
+
+    files = [make_file(tmp_path, 'f0'), make_file(tmp_path, 'f1')]
+    t = np.array(['2020-10-31 00:00', '2020-10-31 00:10'],
+                 dtype='datetime64[ns]')
+
+    manifest = get_manifest(tmp_path)
+    assert manifest.get_new_files(files) == files
+    manifest.update(files, t, np.array([[1., 2.], [3., 4.]]))
+
+    # Next run: 1 new file and 1 changed file
+    files.append(make_file(tmp_path, 'f2'))
+    make_file(tmp_path, 'f0', 'ab')
+
+    manifest = get_manifest(tmp_path)
+    new_files = manifest.get_new_files(files)
+    assert new_files == [files[0], files[2]]
+
+    t_new = np.array(['2020-10-31 00:00', '2020-10-31 00:20'],
+                     dtype='datetime64[ns]')
+    manifest.update(new_files, t_new, np.array([[5., 6.], [7., 8.]]))
+
+    manifest = get_manifest(tmp_path)
+    assert manifest.get_new_files(files) == []
+
+    df = manifest.get_df(files, [40, 80])
+
+    assert list(df.index) == list(pd.DatetimeIndex(np.concatenate(
+        [t, t_new[1:]])))
+    assert df.values.tolist() == [[5., 6.], [3., 4.], [7., 8.]]
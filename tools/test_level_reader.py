@@ -0,0 +1,116 @@
+# This script runs unit tests for level_reader.
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from tools.level_reader import read_levels
+from tools.series_cache import series_cache
+from tools.ingest_manifest import ingest_manifest
+
+file_regex = r'^f_(\d{4})$'
+time_format = '%H%M'
+
+values_eg = {'f_0000': [1., 2.], 'f_0010': [999., 4.],
+             'f_0020': [np.ma.masked, 6.]}
+
+
+class parser_eg:
+
+    def __init__(self, tmp_path, cache=False, incremental=False):
+
+        self.path = str(tmp_path / 'data')
+        self.window = (pd.Timestamp('1900-01-01 00:00'),
+                       pd.Timestamp('1900-01-01 00:20'))
+        self.workers = 1
+        self.flag = 999
+        self.target_var = 'ws'
+
+        conf = {'cache': {'path': str(tmp_path / 'cache')}}
+        self.cache = series_cache(conf) if cache else None
+        self.manifest = ingest_manifest(conf) if incremental else None
+
+        self.read_info = None
+
+    def add_read_info(self, read_info):
+
+        self.read_info = read_info
+
+
+def make_files(tmp_path):
+
+    (tmp_path / 'data').mkdir(exist_ok=True)
+
+    for name in values_eg:
+        (tmp_path / 'data' / name).write_text(name)
+
+
+def read_file(file_path, read_list):
+
+    name = file_path.split('/')[-1]
+    read_list.append(name)
+
+    t = pd.Timestamp('1900-01-01 '+name[2:4]+':'+name[4:])
+
+    return t, values_eg[name], 'info_'+name
+
+
+def get_df_eg():
+
+    return pd.DataFrame(
+        {40: [1., np.nan, np.nan], 80: [2., 4., 6.]},
+        index=pd.DatetimeIndex(np.array(
+            ['1900-01-01 00:00', '1900-01-01 00:10', '1900-01-01 00:20'],
+            dtype='datetime64[ns]'), name='t')
+        )
+
+
+def test_read_levels(tmp_path):
+
+    make_files(tmp_path)
+    parser = parser_eg(tmp_path)
+    read_list = []
+
+    df = read_levels(parser, lambda f: read_file(f, read_list), {},
+                     [40, 80], file_regex, time_format)
+
+    assert_frame_equal(df, get_df_eg())
+    assert parser.file_num == 3
+    assert parser.read_info == [('info_f_0000',), ('info_f_0010',),
+                                ('info_f_0020',)]
+
+
+def test_read_levels_cache(tmp_path):
+
+    make_files(tmp_path)
+    read_list = []
+
+    for run in range(2):
+
+        parser = parser_eg(tmp_path, cache=True)
+
+        df = read_levels(parser, lambda f: read_file(f, read_list),
+                         {'var': 'ws'}, [40, 80], file_regex, time_format)
+
+        assert_frame_equal(df, get_df_eg(), check_column_type=False)
+
+    # Files are not read again in the second run
+    assert len(read_list) == 3
+    assert parser.file_num == 3
+
+
+def test_read_levels_incremental(tmp_path):
+
+    make_files(tmp_path)
+    read_list = []
+
+    for run in range(2):
+
+        parser = parser_eg(tmp_path, incremental=True)
+
+        df = read_levels(parser, lambda f: read_file(f, read_list),
+                         {'var': 'ws'}, [40, 80], file_regex, time_format)
+
+        assert_frame_equal(df, get_df_eg())
+
+    assert len(read_list) == 3
@@ -0,0 +1,90 @@
+# This script runs unit tests for metric_accumulator.
+
+import numpy as np
+
+from tools import eval_tools
+from tools.metric_accumulator import metric_accumulator, accumulator_metrics
+
+
+def get_data():
+
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 15, 10000)
+    y = x + rng.normal(0.5, 2, 10000)
+    x[::100] = 0
+
+    return x, y
+
+
+def assert_batch(acc, x, y):
+
+    result = acc.compute(accumulator_metrics)
+
+    for name in accumulator_metrics:
+
+        expected = eval_tools.get_module_class('metrics', name)().compute(
+            x, y)
+
+        assert np.isclose(result[name], expected, rtol=1e-10), name
+
+
+def test_update_chunks():
+
+    x, y = get_data()
+
+    acc = metric_accumulator()
+
+    for i in range(0, len(x), 999):
+        acc.update(x[i:i+999], y[i:i+999])
+
+    assert acc.invalid_num == 100
+    assert_batch(acc, x, y)
+
+
+def test_merge():
+
+    x, y = get_data()
+
+    # e.g. from 3 processes, including an empty chunk
+    acc_list = [metric_accumulator().update(x[:10], y[:10]),
+                metric_accumulator().update(x[10:10], y[10:10]),
+                metric_accumulator().update(x[10:], y[10:])]
+
+    acc = metric_accumulator()
+
+    for a in acc_list:
+        acc.merge(a)
+
+    assert_batch(acc, x, y)
+
+
+def test_empty():
+
+    assert np.isnan(metric_accumulator().compute(['rmse'])['rmse'])
+
+
+def test_median():
+
+    x, y = get_data()
+    names = ['mdae', 'mdae_pct', 'msa']
+
+    exact = metric_accumulator(median=True)
+    approx = metric_accumulator(median=True, alpha=0.01, exact_limit=100)
+
+    for i in range(0, len(x), 999):
+        exact.update(x[i:i+999], y[i:i+999])
+        approx.update(x[i:i+999], y[i:i+999])
+
+    for name, val in exact.compute(names).items():
+
+        expected = eval_tools.get_module_class('metrics', name)().compute(
+            x, y)
+
+        assert np.isclose(val, expected), name
+
+    # msa is (exp(median) - 1) * 100, so compare medians
+    result = approx.compute(names)
+
+    assert abs(result['mdae'] / exact.compute(['mdae'])['mdae'] - 1) <= 0.01
+    assert abs(np.log1p(result['msa'] / 100)
+               / np.log1p(exact.compute(['msa'])['msa'] / 100) - 1) <= 0.01
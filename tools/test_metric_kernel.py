@@ -0,0 +1,42 @@
+# This script runs unit tests for metric_kernel.
+
+import numpy as np
+import pandas as pd
+
+from tools import eval_tools, metric_kernel
+
+# Example data series, with 0 in baseline
+x_eg = pd.Series([2, 2, 0, 2, 16, 3])
+y_eg = pd.Series([4, 5, 6, -7, 8, 3])
+
+
+def test_compute():
+
+    result = metric_kernel.compute(x_eg, y_eg, metric_kernel.fused_metrics)
+
+    for name in metric_kernel.fused_metrics:
+
+        expected = eval_tools.get_module_class('metrics', name)().compute(
+            x_eg, y_eg)
+
+        assert np.isclose(result[name], expected, equal_nan=True), name
+
+
+def test_compute_rows():
+
+    rng = np.random.default_rng(0)
+    x = rng.uniform(1, 15, (3, 100))
+    y = rng.uniform(1, 15, (3, 100))
+
+    result = metric_kernel.compute(x, y, metric_kernel.fused_metrics)
+
+    for i in range(len(x)):
+        for name, val in metric_kernel.compute(
+                x[i], y[i], metric_kernel.fused_metrics).items():
+
+            assert np.isclose(result[name][i], val), name
+
+
+def test_compute_unknown():
+
+    assert metric_kernel.compute(x_eg, y_eg, ['dracarys']) == {}
@@ -0,0 +1,57 @@
+# This script runs unit tests for quantile_sketch.
+
+import numpy as np
+
+from tools.quantile_sketch import quantile_sketch
+
+
+def get_values():
+
+    rng = np.random.default_rng(0)
+
+    return np.abs(rng.normal(0, 3, 10001))
+
+
+def test_exact():
+
+    v = get_values()
+
+    sketch = quantile_sketch().update(v[:5000]).update(v[5000:])
+
+    assert sketch.is_exact()
+    assert sketch.get_median() == np.median(v)
+
+
+def test_histogram():
+
+    v = get_values()
+    alpha = 0.01
+
+    sketch = quantile_sketch(alpha=alpha, exact_limit=100)
+
+    for i in range(0, len(v), 1000):
+        sketch.update(v[i:i+1000])
+
+    assert not sketch.is_exact()
+    assert abs(sketch.get_median() / np.median(v) - 1) <= alpha
+
+
+def test_merge():
+
+    v = np.append(get_values(), [0, np.inf, np.nan])
+
+    whole = quantile_sketch(exact_limit=100).update(v)
+
+    # Exact and histogram sketches, e.g. from 3 workers
+    sketch = quantile_sketch(exact_limit=100).update(v[:50])
+    sketch.merge(quantile_sketch(exact_limit=100).update(v[50:5000]))
+    sketch.merge(quantile_sketch(exact_limit=100).update(v[5000:]))
+
+    assert sketch.n == len(v) - 1
+    assert np.array_equal(sketch.counts, whole.counts)
+    assert sketch.get_median() == whole.get_median()
+
+
+def test_empty():
+
+    assert np.isnan(quantile_sketch().get_median())
@@ -0,0 +1,81 @@
+# This script runs unit tests for series_cache.
+
+import os
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from tools.series_cache import series_cache, get_series_cache
+
+df_eg = pd.DataFrame(
+    {40: [1., np.nan, 3.], 80: [4., 5., 6.]},
+    index=pd.DatetimeIndex(np.array(
+        ['2020-10-31 00:00', '2020-10-31 00:10', '2020-10-31 00:20'],
+        dtype='datetime64[ns]'), name='t')
+    )
+
+
+def get_conf(tmp_path, size_mb=1024):
+
+    return {'cache': {'path': str(tmp_path / 'cache'), 'series': True,
+                      'size_mb': size_mb}}
+
+
+def make_file(tmp_path, name, content):
+
+    file = tmp_path / name
+    file.write_text(content)
+
+    return str(file)
+
+
+def test_get_series_cache(tmp_path):
+
+    assert get_series_cache({}) is None
+    assert get_series_cache({'cache': {'path': 'cache'}}) is None
+    assert isinstance(get_series_cache(get_conf(tmp_path)), series_cache)
+
+
+def test_save_load(tmp_path):
+
+    cache = series_cache(get_conf(tmp_path))
+    file = make_file(tmp_path, 'a.nc', 'a')
+
+    key = cache.get_key({'var': 'ws', 'levels': [40, 80]}, [file])
+
+    assert cache.load(key) is None
+
+    cache.save(key, df_eg)
+
+    assert_frame_equal(cache.load(key), df_eg, check_column_type=False)
+
+
+def test_key_changes(tmp_path):
+
+    cache = series_cache(get_conf(tmp_path))
+    file = make_file(tmp_path, 'a.nc', 'a')
+    info = {'var': 'ws', 'levels': [40, 80]}
+
+    key = cache.get_key(info, [file])
+
+    assert cache.get_key({'var': 'ws', 'levels': [40]}, [file]) != key
+
+    make_file(tmp_path, 'a.nc', 'ab')
+
+    assert cache.get_key(info, [file]) != key
+
+
+def test_evict(tmp_path):
+
+    # Only allow one entry
+    cache = series_cache(get_conf(tmp_path, size_mb=5e-4))
+
+    cache.save('old', df_eg)
+
+    # Make the first entry the least recently used
+    os.utime(os.path.join(cache.path, 'old', 'meta.json'), (0, 0))
+
+    cache.save('new', df_eg)
+
+    assert cache.load('old') is None
+    assert cache.load('new') is not None
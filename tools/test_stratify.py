@@ -0,0 +1,66 @@
+# This script runs unit tests for stratify and metric_kernel.compute_grouped.
+
+import numpy as np
+import pandas as pd
+
+from tools import stratify, metric_kernel, eval_tools
+
+
+def get_data():
+
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2020-01-01', periods=3000, freq='3h')
+    x = rng.uniform(0, 15, len(index))
+    y = rng.uniform(0, 15, len(index))
+    x[::40] = 0
+
+    return index, x, y
+
+
+def test_compute_grouped():
+
+    index, x, y = get_data()
+
+    # Group 3 is empty
+    g = np.arange(len(x)) % 5
+    g[g == 3] = 4
+
+    result = metric_kernel.compute_grouped(x, y, g, 5,
+                                           metric_kernel.fused_metrics,
+                                           verbose=False)
+
+    for name in metric_kernel.fused_metrics:
+
+        expected = [metric_kernel.compute(x[g == i], y[g == i], [name],
+                                          verbose=False)[name]
+                    if i != 3 else np.nan for i in range(5)]
+
+        np.testing.assert_allclose(result[name], expected, rtol=1e-12)
+
+
+def test_get_groups():
+
+    index = pd.DatetimeIndex(['2020-01-31 23:00', '2020-04-01 05:00',
+                              '2020-12-01 12:00'])
+
+    assert list(stratify.get_groups(index, 'hour')[0]) == [23, 5, 12]
+    assert list(stratify.get_groups(index, 'month')[0]) == [0, 3, 11]
+    assert list(stratify.get_groups(index, 'season')[0]) == [0, 1, 0]
+
+
+def test_get_metrics():
+
+    index, x, y = get_data()
+    metrics = [eval_tools.get_module_class('metrics', m)()
+               for m in ['bias', 'rmse']]
+
+    df = stratify.get_metrics(index, x, y, metrics, ['hour', 'season'])
+
+    assert len(df) == (24 + 4) * 2
+    assert df[df['stratum'] == 'hour']['n'].sum() == 3000 * 2
+
+    summer = df[(df['group'] == 'JJA') & (df['metric'] == 'rmse')]
+    mask = np.asarray(index.month.isin([6, 7, 8]))
+
+    assert np.isclose(summer['value'].iloc[0],
+                      metrics[1].compute(x[mask], y[mask]))
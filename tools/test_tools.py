@@ -1,6 +1,7 @@
 # This script runs unit tests for functions in eval_tools.
 
 import math
+import numpy as np
 
 from tools import eval_tools
 
@@ -20,3 +21,111 @@ def test_calculate_angle_diff():
     assert_calculate_angle_diff(0, 180, 180)
     assert_calculate_angle_diff(0, 179, 179)
     assert_calculate_angle_diff(0, 181, 179)
+
+
+def get_power_loop(ws, curve_ws, curve_power):
+    """Row-by-row power curve assignment, as previously in pc_csv."""
+
+    power = np.zeros(len(ws))
+    power[np.isnan(ws)] = np.nan
+
+    for ws_i, power_i in zip(curve_ws, curve_power):
+        power[ws > ws_i] = power_i
+
+    return power
+
+
+def test_get_power_from_curve_step():
+
+    ws = np.array([np.nan, 0, 3, 3.1, 3.25, 3.3, 4, 26, 30])
+    curve_ws = np.array([3, 3.25, 3.5, 25])
+    curve_power = np.array([0, 55, 78, 2400])
+
+    result = eval_tools.get_power_from_curve(ws, curve_ws, curve_power)
+
+    np.testing.assert_array_equal(
+        result, [np.nan, 0, 0, 0, 0, 55, 78, 2400, 2400])
+
+
+def test_get_power_from_curve_step_loop():
+
+    rng = np.random.default_rng(0)
+    ws = rng.uniform(0, 30, 1000)
+    ws[::50] = np.nan
+
+    # Unsorted power curve with duplicated wind speeds
+    curve_ws = np.array([3, 4, 3.5, 5, 4, 20, 25])
+    curve_power = np.array([0, 100, 50, 300, 120, 2000, 2400])
+
+    np.testing.assert_array_equal(
+        eval_tools.get_power_from_curve(ws, curve_ws, curve_power),
+        get_power_loop(ws, curve_ws, curve_power))
+
+
+def test_get_power_from_curve_linear():
+
+    ws = np.array([[np.nan, 2], [3.5, 30]])
+
+    result = eval_tools.get_power_from_curve(
+        ws, [3, 4, 25], [0, 100, 2400], method='linear')
+
+    np.testing.assert_array_equal(result, [[np.nan, 0], [50, 2400]])
+
+
+def test_get_power_from_curves():
+
+    rng = np.random.default_rng(1)
+    ws = rng.uniform(0, 30, (500, 2, 3))
+    ws[0, 0, 1] = np.nan
+
+    curves = [([3, 4, 3.5, 5, 4, 20, 25], [0, 100, 50, 300, 120, 2000, 2400]),
+              ([3.5, 4, 25], [78, 161, 3600]),
+              ([2, 12], [0, 1500])]
+
+    for method in ['step', 'linear']:
+
+        result = eval_tools.get_power_from_curves(ws, curves, method=method)
+
+        for k, (curve_ws, curve_power) in enumerate(curves):
+
+            # One power curve uses np.interp for linear interpolation,
+            # which only differs in rounding
+            np.testing.assert_allclose(
+                result[..., k],
+                eval_tools.get_power_from_curve(ws[..., k], curve_ws,
+                                                curve_power, method=method),
+                rtol=1e-12 if method == 'linear' else 0)
+
+    # Sorted power curves, as in np.interp
+    result = eval_tools.get_power_from_curves(ws, curves, method='linear')
+
+    for k in [1, 2]:
+
+        curve_ws, curve_power = curves[k]
+        expected = np.interp(ws[..., k], curve_ws, curve_power, left=0,
+                             right=curve_power[-1])
+
+        np.testing.assert_allclose(result[..., k], expected)
+
+
+def test_get_wd_angle_diff():
+
+    x = np.array([0, 90, 0, 315, 0, 0, 0, 350, np.nan])
+    y = np.array([0, 90, 315, 0, 180, 179, 181, 10, 10])
+
+    result = eval_tools.get_wd_angle_diff(x, y)
+
+    np.testing.assert_allclose(result, [0, 0, 45, 45, 180, 179, 179, 20,
+                                        np.nan], rtol=1e-4)
+    np.testing.assert_allclose(
+        result[:-1], [eval_tools.calculate_angle_diff(x_i, y_i)
+                      for x_i, y_i in zip(x[:-1], y[:-1])])
+
+
+def test_get_wd_angle_diff_signed():
+
+    result = eval_tools.get_wd_angle_diff([0, 0, 350, 10, 90],
+                                          [315, 45, 10, 350, 100],
+                                          signed=True)
+
+    np.testing.assert_allclose(result, [-45, 45, 20, -20, 10])
@@ -0,0 +1,32 @@
+# This script runs unit tests for ts_builder.
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from tools.ts_builder import ts_builder
+
+
+def test_ts_builder():
+
+    ts = ts_builder([40, 80], size=1)
+
+    # Out of order, and more rows than the preallocated size
+    ts.add(pd.Timestamp('2020-10-31 00:10'), [3, np.nan])
+    ts.add(pd.Timestamp('2020-10-31 00:00'), [1, 2])
+    ts.add(pd.Timestamp('2020-10-31 00:20'), [5, 6])
+
+    expected = pd.DataFrame(
+        {40: [1., 3., 5.], 80: [2., np.nan, 6.]},
+        index=pd.DatetimeIndex(np.array(
+            ['2020-10-31 00:00', '2020-10-31 00:10', '2020-10-31 00:20'],
+            dtype='datetime64[ns]'), name='t')
+        )
+
+    assert ts.n == 3
+    assert_frame_equal(ts.get_df(), expected)
+
+
+def test_empty_ts_builder():
+
+    assert ts_builder(['ws']).get_df().empty
@@ -0,0 +1,57 @@
+# This script contains a time series builder for input parsers.
+# Time stamps and values are collected into preallocated NumPy arrays,
+# and the data frame is only built once at the end, instead of appending
+# to a data frame row by row.
+
+import numpy as np
+import pandas as pd
+
+
+class ts_builder:
+    """Collect time stamps and values of one or more columns,
+    then build a datetime-indexed data frame.
+    """
+
+    def __init__(self, columns, size=0):
+
+        self.columns = list(columns)
+        self.n = 0
+
+        self.t = np.empty(size, dtype='datetime64[ns]')
+        self.values = np.full((size, len(self.columns)), np.nan)
+
+    def grow(self):
+        """Double the size of the arrays when they are full."""
+
+        size = max(2 * len(self.t), 1)
+
+        t = np.empty(size, dtype='datetime64[ns]')
+        t[:self.n] = self.t[:self.n]
+
+        values = np.full((size, len(self.columns)), np.nan)
+        values[:self.n] = self.values[:self.n]
+
+        self.t = t
+        self.values = values
+
+    def add(self, t, values):
+        """Add values of all columns at time t."""
+
+        if self.n == len(self.t):
+            self.grow()
+
+        self.t[self.n] = np.datetime64(t, 'ns')
+        self.values[self.n] = values
+
+        self.n += 1
+
+    def get_df(self, index_name='t'):
+        """Build the data frame once, sorted by time."""
+
+        df = pd.DataFrame(
+            self.values[:self.n].copy(),
+            index=pd.DatetimeIndex(self.t[:self.n], name=index_name),
+            columns=self.columns
+            )
+
+        return df.sort_index(kind='stable')
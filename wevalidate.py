@@ -8,6 +8,7 @@
 
 import yaml
 import sys
+import inspect
 import os
 import pathlib
 import numpy as np
@@ -16,6 +17,19 @@ import pandas as pd
 from tools import eval_tools, cal_print_metrics
 
 
+def get_table_df(table_df, lev, base, c, var):
+    """Add level, dataset names and variable to a tidy table of metrics,
+    e.g. stratified or binned metrics.
+    """
+
+    table_df.insert(0, 'level', lev)
+    table_df.insert(1, 'truth name', base['name'])
+    table_df.insert(2, 'model name', c['name'])
+    table_df.insert(3, 'var', var)
+
+    return table_df
+
+
 def compare(config=None):
 
     config_dir = os.path.join((pathlib.Path(os.getcwd()).parent), 'config')
@@ -49,9 +63,29 @@ def compare(config=None):
     # Data frame containing data at all heights
     all_lev_df = pd.DataFrame()
     all_lev_stat_df = pd.DataFrame()
+    # Tidy tables of stratified and binned metrics
+    all_table_dict = {'stratified': [], 'binned': []}
+    all_sweep_list = []
+
+    # Lagged differences shared by ramp definitions and ramp sweeps
+    lagged_cache = eval_tools.get_module_class('ramps', 'ramp_cache')()
     all_ramp_ts_df = pd.DataFrame()
     all_ramp_stat_df = pd.DataFrame()
 
+    # Run __init__ once for each dataset, instead of once for each level
+    for d in [base] + comp:
+
+        d['input'] = eval_tools.get_module_class(
+            'inputs', d['function'])(d, conf)
+
+        # Read in all levels in one pass when the input parser supports it
+        if hasattr(d['input'], 'get_ts_all_levels'):
+
+            print()
+            print('********** reading '+d['name']+' at all levels **********')
+
+            d['input'].get_ts_all_levels(conf['levels']['height_agl'])
+
     for lev in conf['levels']['height_agl']:
 
         # For data storage and metrics computation
@@ -65,10 +99,6 @@ def compare(config=None):
         print()
         print('********** for '+base['name']+': **********')
 
-        # Run __init__
-        base['input'] = eval_tools.get_module_class(
-            'inputs', base['function'])(base, conf)
-
         base['data'] = base['input'].get_ts(lev)
 
         # For each specified comparison dataset
@@ -77,10 +107,6 @@ def compare(config=None):
             print()
             print('********** for '+c['name']+': **********')
 
-            # Run __init__
-            c['input'] = eval_tools.get_module_class(
-                'inputs', c['function'])(c, conf)
-
             c['data'] = c['input'].get_ts(lev)
 
             results = eval_tools.append_results(results, base, c, conf)
@@ -94,6 +120,13 @@ def compare(config=None):
 
             metricstat_dict = {key: results[ind][key]
                                for key in conf['metrics']}
+
+            # Bootstrap confidence intervals, if any
+            for key, (low, high) in results[ind].get('ci', {}).items():
+
+                metricstat_dict[key+'_ci_low'] = low
+                metricstat_dict[key+'_ci_high'] = high
+
             metricstat_df = pd.DataFrame.from_dict(
                 metricstat_dict, orient='index', columns=[c['target_var']]
                 )
@@ -102,6 +135,15 @@ def compare(config=None):
                 [[lev], [c['name']], metricstat_df.columns]
                 )
 
+            # Metrics by hour of day, month or season,
+            # and by wind speed bin or wind direction sector
+            for key, table_list in all_table_dict.items():
+
+                if results[ind].get(key) is not None:
+
+                    table_list.append(get_table_df(
+                        results[ind][key], lev, base, c, c['target_var']))
+
             if all_lev_stat_df.empty:
                 all_lev_stat_df = all_lev_stat_df.append(metricstat_df)
             else:
@@ -121,9 +163,15 @@ def compare(config=None):
 
                 for ramps in conf['ramps']:
 
-                    r = eval_tools.get_module_class(
-                        'ramps', ramps['definition'])(
-                            conf, c, ramp_data, ramps)
+                    ramp_class = eval_tools.get_module_class(
+                        'ramps', ramps['definition'])
+
+                    # Share lagged differences if the definition supports it
+                    if 'cache' in inspect.signature(ramp_class).parameters:
+                        r = ramp_class(conf, c, ramp_data, ramps,
+                                       cache=lagged_cache, lev=lev)
+                    else:
+                        r = ramp_class(conf, c, ramp_data, ramps)
 
                     print()
                     print('@@@@@~~ calculating ramp skill scores at '+str(lev)
@@ -136,7 +184,19 @@ def compare(config=None):
                     process_ramp = eval_tools.get_module_class(
                         'ramps', 'process_ramp')(ramp_df)
 
-                    ramp_df = process_ramp.add_contingency_table()
+                    # Boolean columns of the contingency table are only
+                    # needed for plotting and time series output
+                    bool_cols = ramps.get('plotting', False) is True or (
+                        'output' in conf and conf['output']['writing'] is True)
+
+                    ramp_df = process_ramp.add_contingency_table(
+                        bool_cols=bool_cols)
+
+                    # Event-based matching within a timing tolerance
+                    if 'event_tolerance' in ramps:
+                        process_ramp.add_event_table(
+                            conf['base']['target_var'], c['target_var'],
+                            ramps['event_tolerance'])
 
                     plot_ramp = eval_tools.get_module_class(
                         'plotting', 'plot_ramp')(
@@ -149,6 +209,8 @@ def compare(config=None):
                     
                             plot_ramp.plot_ts_contingency()
                             process_ramp.print_contingency_table()
+                            if process_ramp.event is not None:
+                                process_ramp.print_event_table()
                             # Print skill scores
                             # process_ramp.cal_print_scores()
 
@@ -179,6 +241,30 @@ def compare(config=None):
                             [all_ramp_ts_df, ramp_df], axis=1
                             )
 
+            # Ramp skill scores for many ramp magnitudes and durations
+            if 'ramp_sweep' in conf:
+
+                sweep_data = cal_print_metrics.remove_na(
+                    combine_df, ramp_txt=True
+                    )
+
+                sweep_ramp = eval_tools.get_module_class(
+                    'ramps', 'sweep_ramp')(
+                        conf, c, sweep_data, conf['ramp_sweep'],
+                        cache=lagged_cache, lev=lev)
+
+                sweep_df = sweep_ramp.get_sweepdf()
+
+                if conf['ramp_sweep'].get('plotting', False) is True:
+                    sweep_ramp.plot_roc(lev, conf['levels']['height_units'])
+
+                sweep_df.insert(0, 'level', lev)
+                sweep_df.insert(1, 'truth name', base['name'])
+                sweep_df.insert(2, 'model name', c['name'])
+                sweep_df.insert(3, 'var', c['target_var'])
+
+                all_sweep_list.append(sweep_df)
+
             combine_df.columns = pd.MultiIndex.from_product(
                 [[lev], [c['name']], combine_df.columns]
                 )
@@ -208,6 +294,24 @@ def compare(config=None):
                              'metrics_'+conf['output']['org']+'.csv')
                 )
 
+            for key, table_list in all_table_dict.items():
+
+                if table_list:
+
+                    pd.concat(table_list, ignore_index=True).to_csv(
+                        os.path.join(output_path,
+                                     'metrics_'+key+'_'+conf['output']['org']
+                                     + '.csv'), index=False
+                        )
+
+            if all_sweep_list:
+
+                pd.concat(all_sweep_list, ignore_index=True).to_csv(
+                    os.path.join(output_path,
+                                 'ramp_sweep_'+conf['output']['org']+'.csv'),
+                    index=False
+                    )
+
             if 'ramps' in conf:
 
                 all_ramp_stat_df.to_csv(
@@ -220,13 +324,76 @@ def compare(config=None):
                     )
 
     pc_results = []
+    # Tidy table of stratified metrics of derived power
+    pc_table_list = []
 
     # For power curve
     for ind, c in enumerate(comp):
 
+        # For a fleet of turbine types, if both variables are wind speeds
+        # and all hub heights exist in user-defined validation levels
+        if (
+            base['nature'] == 'ws' and c['nature'] == 'ws'
+            and 'fleet' in p_curve
+        ):
+
+            pc_fleet = eval_tools.get_module_class(
+                'inputs', 'pc_fleet_csv')(
+                p_curve['path'], p_curve['fleet'], p_curve['ws'],
+                p_curve['power'], all_lev_df, c['name'], conf
+                )
+
+            hh = pc_fleet.get_hub_height_name()
+
+            print()
+            print('######################### deriving wind farm power at '
+                  + hh+' '+conf['levels']['height_units']
+                  + ' #########################')
+            print()
+            print('use fleet: '+p_curve['fleet'])
+
+            if not set(pc_fleet.get_hub_heights()).issubset(
+                    all_lev_df.columns.get_level_values(0)):
+
+                print()
+                print('not deriving power for '+c['name']+',')
+                print('hub heights of the fleet do not all exist in'
+                      + ' validation data')
+                continue
+
+            power_df = pc_fleet.get_power()
+
+            pc_results = eval_tools.append_results(pc_results, base, c, conf)
+
+            cal_print_metrics.run(
+                power_df, metrics, pc_results, ind, c, conf, base, hh,
+                binned=False
+                )
+
+            if pc_results[ind].get('stratified') is not None:
+
+                pc_table_list.append(get_table_df(
+                    pc_results[ind]['stratified'], hh, base, c,
+                    power_df.columns[1]))
+
+            pc_fleet.plot_power_ts()
+
+            pc_fleet.plot_power_scatter()
+
+            # Generate derived power output file of each turbine type
+            # and of the wind farm, in MW
+            if 'output_path' in p_curve:
+
+                pd.concat(
+                    [pc_fleet.type_power_df, power_df], axis=1
+                    ).div(1e3).to_csv(
+                    os.path.join(output_path, p_curve['output_path'],
+                                 'derived_fleet_power_'+c['name']+'.csv')
+                    )
+
         # If both variables are wind speeds
         # and hub height exists in user-defined validation levels
-        if (
+        elif (
             base['nature'] == 'ws' and c['nature'] == 'ws'
             and p_curve['hub_height'] in all_lev_df.columns.get_level_values(0)
         ):
@@ -254,9 +421,16 @@ def compare(config=None):
             pc_results = eval_tools.append_results(pc_results, base, c, conf)
 
             cal_print_metrics.run(
-                power_df, metrics, pc_results, ind, c, conf, base, hh
+                power_df, metrics, pc_results, ind, c, conf, base, hh,
+                binned=False
                 )
 
+            if pc_results[ind].get('stratified') is not None:
+
+                pc_table_list.append(get_table_df(
+                    pc_results[ind]['stratified'], hh, base, c,
+                    power_df.columns[1]))
+
             # Plot simulated power curves, not extremely useful
             # pc_csv.plot_pc()
             
@@ -310,3 +484,15 @@ def compare(config=None):
                   + 'or hub height does not exist in validation data,\n'
                   + 'hence power curve is not derived'
                   )
+
+    # Stratified metrics of derived power, next to those of wind speed
+    if pc_table_list and 'output' in conf and (
+            conf['output']['writing'] is True):
+
+        if conf['output']['format'] == 'csv':
+
+            pd.concat(pc_table_list, ignore_index=True).to_csv(
+                os.path.join(output_path,
+                             'metrics_stratified_power_'
+                             + conf['output']['org']+'.csv'), index=False
+                )